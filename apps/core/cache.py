@@ -0,0 +1,52 @@
+"""
+Version-stamped caching for read-heavy endpoints.
+
+Results are cached per endpoint name and per query string. Every key carries
+a version stamp stored under "<prefix>:version", so invalidating everything
+under a prefix is a single write that works on any cache backend (Redis in
+production, LocMem in development).
+"""
+
+from django.core.cache import cache
+import hashlib
+import json
+import time
+
+
+class VersionedCache:
+    def __init__(self, prefix, timeout):
+        self.prefix = prefix
+        self.version_key = f"{prefix}:version"
+        self.timeout = timeout
+
+    def _version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # A time-based seed never collides with keys from before an eviction
+            version = int(time.time())
+            cache.add(self.version_key, version, None)
+            version = cache.get(self.version_key, version)
+        return version
+
+    def get_or_compute(self, name, query_params, compute, timeout=None, should_cache=None):
+        """
+        Return the cached result of compute() for this endpoint and query string.
+        If should_cache is given, results it rejects are returned but not cached.
+        """
+        params = json.dumps(sorted(query_params.lists()))
+        digest = hashlib.md5(params.encode()).hexdigest()
+        key = f"{self.prefix}:{self._version()}:{name}:{digest}"
+
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            if should_cache is None or should_cache(result):
+                cache.set(key, result, self.timeout if timeout is None else timeout)
+        return result
+
+    def invalidate(self):
+        """Invalidate every result cached under this prefix."""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, int(time.time()), None)
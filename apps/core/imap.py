@@ -0,0 +1,86 @@
+"""
+Process-wide pool of logged-in IMAP connections.
+
+Connections are keyed by (host, port, user) and checked out for exclusive use,
+so two syncs never share a socket. A reused connection is validated with NOOP;
+idle connections beyond max_size are logged out, least recently used first.
+"""
+
+import imaplib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IMAPConnectionPool:
+    def __init__(self, max_size=20):
+        self.max_size = max_size
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, host, port, user, password, timeout=30, mailbox=None):
+        """
+        Yield a logged-in connection, with mailbox selected if given. It goes
+        back to the pool on success and is logged out if the block raises.
+        """
+        key = (host, port, user)
+        conn = self._acquire(key, password, timeout, mailbox)
+        try:
+            yield conn
+        except Exception:
+            self._close(conn)
+            raise
+        self._release(key, conn)
+
+    def _acquire(self, key, password, timeout, mailbox):
+        with self._lock:
+            conn = self._idle.pop(key, None)
+
+        if conn is not None:
+            try:
+                conn.noop()
+                return conn
+            except (imaplib.IMAP4.error, OSError):
+                self._close(conn)
+
+        host, port, user = key
+        logger.info("Connecting to IMAP %s:%s as %s", host, port, user)
+        conn = imaplib.IMAP4_SSL(host, port, timeout=timeout)
+        try:
+            conn.login(user, password)
+            if mailbox:
+                conn.select(mailbox)
+        except Exception:
+            self._close(conn)
+            raise
+        return conn
+
+    def _release(self, key, conn):
+        stale = []
+        with self._lock:
+            previous = self._idle.pop(key, None)
+            if previous is not None:
+                stale.append(previous)
+            self._idle[key] = conn
+            while len(self._idle) > self.max_size:
+                stale.append(self._idle.popitem(last=False)[1])
+
+        # Logging out is network I/O, so it happens outside the lock
+        for old in stale:
+            self._close(old)
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.logout()
+        except Exception:
+            pass
+
+
+imap_pool = IMAPConnectionPool(max_size=getattr(settings, 'IMAP_POOL_SIZE', 20))
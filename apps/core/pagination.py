@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
 from collections import OrderedDict
 
@@ -50,4 +50,34 @@ class SmallResultsSetPagination(PageNumberPagination):
             ('next', self.get_next_link()),
             ('previous', self.get_previous_link()),
             ('results', data)
-        ])) 
\ No newline at end of file
+        ])) 
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Keyset pagination on (-created_at, -id) for large, append-mostly tables.
+
+    Pages cost O(page_size) regardless of depth. The total count requires a
+    full scan, so it is only returned when ?include_count=1 is passed.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get('include_count') in ('1', 'true'):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([('success', True)])
+        if self.count is not None:
+            payload['count'] = self.count
+        payload.update([
+            ('page_size', self.page_size),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ])
+        return Response(payload)
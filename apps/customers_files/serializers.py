@@ -61,6 +61,7 @@ class CustomerFileSerializer(serializers.ModelSerializer):
         """Custom create method to handle file upload and auto-detection"""
         import os
         import mimetypes
+        import shutil
         import tempfile
         import logging
         from apps.customers.models import Customer
@@ -99,17 +100,21 @@ class CustomerFileSerializer(serializers.ModelSerializer):
             file_type = validated_data.get('file_type', '')
             if not validated_data.get('pan_number') and file_type and 'image' in file_type.lower():
                 try:
-                    file_extension = os.path.splitext(uploaded_file.name)[1]
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-                    temp_file_path = temp_file.name
-                    
-                    for chunk in uploaded_file.chunks():
-                        temp_file.write(chunk)
-                    temp_file.close()
+                    if hasattr(uploaded_file, 'temporary_file_path'):
+                        # Disk-backed upload: OCR reads Django's temp file directly,
+                        # which Django removes at the end of the request.
+                        image_path = uploaded_file.temporary_file_path()
+                    else:
+                        file_extension = os.path.splitext(uploaded_file.name)[1]
+                        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
+                            temp_file_path = temp_file.name
+                            uploaded_file.seek(0)
+                            shutil.copyfileobj(uploaded_file, temp_file, 1 << 20)
+                        image_path = temp_file_path
                     
-                    logger.info(f"Processing image for PAN extraction: {temp_file_path}")
+                    logger.info(f"Processing image for PAN extraction: {image_path}")
                     
-                    result = extract_pan_from_image(temp_file_path)
+                    result = extract_pan_from_image(image_path)
                     
                     if result.get('success') and result.get('pan_number'):
                         validated_data['pan_number'] = result['pan_number']
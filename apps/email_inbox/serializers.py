@@ -654,4 +654,12 @@ class CampaignPreviewSerializer(serializers.Serializer):
     template_id = serializers.UUIDField(required=False)
     custom_subject = serializers.CharField(required=False, allow_blank=True)
     additional_message = serializers.CharField(required=False, allow_blank=True)
-    sample_recipient = serializers.DictField(required=False, default=dict)
\ No newline at end of file
+    sample_recipient = serializers.DictField(required=False, default=dict)
+
+class IncomingEmailSerializer(serializers.Serializer):
+    """Serializer for validating incoming email webhook payloads"""
+    from_email = serializers.EmailField()
+    to_email = serializers.EmailField(required=False, allow_blank=True)
+    subject = serializers.CharField(max_length=500, allow_blank=True)
+    html_body = serializers.CharField(required=False, allow_blank=True, default='')
+    text_body = serializers.CharField(required=False, allow_blank=True, default='')
@@ -12,7 +12,7 @@ import csv
 from django.http import HttpResponse
 import uuid
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.template import Template, Context
+from django.template import Template, Context, TemplateDoesNotExist, TemplateSyntaxError
 from .models import (
     EmailInboxMessage, EmailFolder, EmailConversation, EmailFilter,
     EmailAttachment, EmailSearchQuery,EmailInternalNote,
@@ -40,6 +40,7 @@ from .serializers import (EmailInboxMessageSerializer,
     EmailConversationSerializer,
     RecipientImportSerializer,
     CampaignPreviewSerializer,
+    IncomingEmailSerializer,
 )
 from .services import EmailInboxService
 from apps.email_settings.models import EmailAccount
@@ -1168,13 +1169,13 @@ class BulkEmailCampaignViewSet(viewsets.ModelViewSet):
         subject = ""
         body = ""                
         if data.get('template_id'):
+            EmailTemplate = apps.get_model('email_templates', 'EmailTemplate')
             try:
-                EmailTemplate = apps.get_model('email_templates', 'EmailTemplate')
                 template = EmailTemplate.objects.get(id=data['template_id'])
-                subject = template.subject
-                body = getattr(template, 'body_html', getattr(template, 'html_content', ''))
-            except:
+            except EmailTemplate.DoesNotExist:
                 return Response({'error': 'Template not found'}, status=404)
+            subject = template.subject
+            body = getattr(template, 'body_html', getattr(template, 'html_content', ''))
         
         if data.get('custom_subject'):
             subject = data['custom_subject']
@@ -1185,18 +1186,17 @@ class BulkEmailCampaignViewSet(viewsets.ModelViewSet):
             ctx = Context(recipient)
             final_subject = django_subject.render(ctx)
             final_body = django_body.render(ctx)
+        except (TemplateSyntaxError, TemplateDoesNotExist) as e:
+            return Response({'error': f"Merge error: {str(e)}"}, status=400)
             
-            if data.get('additional_message'):
-                add_msg = data['additional_message']
-                final_body = f"<p>{add_msg}</p><hr>{final_body}"
-                
-            return Response({
-                'subject': final_subject,
-                'html_content': final_body
-            })
+        if data.get('additional_message'):
+            add_msg = data['additional_message']
+            final_body = f"<p>{add_msg}</p><hr>{final_body}"
             
-        except Exception as e:
-            return Response({'error': f"Merge error: {str(e)}"}, status=400)
+        return Response({
+            'subject': final_subject,
+            'html_content': final_body
+        })
     @action(detail=False, methods=['get'], url_path='export-template')
     def export_template(self, request):
         response = HttpResponse(content_type='text/csv')
@@ -1220,23 +1220,22 @@ class IncomingEmailWebhookAPIView(APIView):
     permission_classes = [AllowAny] 
 
     def post(self, request):
-        try:
-            data = request.data
-            
-            # Map the incoming JSON to your service's expected arguments
-            service = EmailInboxService()
-            result = service.receive_email(
-                from_email=data.get('from_email'),
-                to_email=data.get('to_email'),
-                subject=data.get('subject'),
-                html_content=data.get('html_body', ''),
-                text_content=data.get('text_body', ''),
-                source='webhook'
-            )
+        serializer = IncomingEmailSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
 
-            if result.get('success'):
-                return Response({'status': 'received', 'id': result.get('email_id')}, status=200)
-            return Response({'error': result.get('message')}, status=500)
+        # receive_email() traps its own failures and reports them via 'success'
+        service = EmailInboxService()
+        result = service.receive_email(
+            from_email=data['from_email'],
+            to_email=data.get('to_email'),
+            subject=data['subject'],
+            html_content=data.get('html_body', ''),
+            text_content=data.get('text_body', ''),
+            source='webhook'
+        )
 
-        except Exception as e:
-            return Response({'error': str(e)}, status=500)
\ No newline at end of file
+        if result.get('success'):
+            return Response({'status': 'received', 'id': result.get('email_id')}, status=200)
+        return Response({'error': result.get('message')}, status=500)
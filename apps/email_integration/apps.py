@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EmailIntegrationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.email_integration'
+
+    def ready(self):
+        import apps.email_integration.signals
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_integration', '0004_rename_email_webhooks_provider_event_idx_email_webho_provide_60e6a6_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailautomationlog',
+            index=models.Index(fields=['automation', '-created_at', '-id'], name='email_autom_automat_875359_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_integration', '0005_emailautomationlog_email_autom_automat_875359_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailwebhook',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('queued', 'Queued'), ('processed', 'Processed'), ('failed', 'Failed'), ('ignored', 'Ignored')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_integration', '0006_alter_emailwebhook_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailautomation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['status'], name='emailauto_active_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailwebhook',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='webhook_pending_idx'),
+        ),
+    ]
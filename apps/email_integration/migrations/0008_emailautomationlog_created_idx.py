@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_integration', '0007_emailautomation_emailauto_active_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailautomationlog',
+            index=models.Index(fields=['created_at'], name='emailauto_log_created_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .serializers import BulkDeleteSerializer
+from .utils import invalidate_stats_cache
+
+
+class DateRangeFilterMixin:
+    """
+    Parse the start_date/end_date query params once into real datetimes.
+
+    Filtering with typed values lets PostgreSQL use the index on the column
+    directly, and malformed input is rejected with a 400 instead of a DB error.
+    """
+
+    def _parse_date_param(self, name, as_date=False):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValidationError({name: f"Invalid date '{value}'. Use ISO 8601 format."})
+            if as_date:
+                return day
+            parsed = timezone.datetime.combine(day, timezone.datetime.min.time())
+
+        if as_date:
+            return parsed.date()
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def apply_date_range(self, queryset, field='created_at', as_date=False):
+        start = self._parse_date_param('start_date', as_date)
+        end = self._parse_date_param('end_date', as_date)
+
+        if start:
+            queryset = queryset.filter(**{f'{field}__gte': start})
+        if end:
+            queryset = queryset.filter(**{f'{field}__lte': end})
+        return queryset
+
+
+class BulkSoftDeleteMixin:
+    """
+    Add a bulk_delete action that soft deletes many rows in one UPDATE.
+
+    soft_delete_updates holds the extra fields the model's soft_delete() sets,
+    e.g. {'is_active': False}.
+    """
+
+    soft_delete_updates = {}
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Soft delete several records with a single query"""
+        serializer = BulkDeleteSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        deleted = self.get_queryset().filter(id__in=serializer.validated_data['ids']).update(
+            is_deleted=True,
+            deleted_at=timezone.now(),
+            deleted_by=request.user,
+            **self.soft_delete_updates
+        )
+        # update() does not send post_save, so statistics are invalidated here
+        invalidate_stats_cache()
+
+        return Response({
+            'success': True,
+            'message': f'{deleted} records deleted successfully',
+            'deleted': deleted
+        })
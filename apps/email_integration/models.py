@@ -32,6 +32,7 @@ class EmailWebhook(models.Model):
     
     STATUS_CHOICES = [
         ('pending', 'Pending'),
+        ('queued', 'Queued'),
         ('processed', 'Processed'),
         ('failed', 'Failed'),
         ('ignored', 'Ignored'),
@@ -71,6 +72,7 @@ class EmailWebhook(models.Model):
             models.Index(fields=['provider', 'event_type']),
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['email_message_id', 'event_type']),
+            models.Index(fields=['created_at'], condition=models.Q(status='pending'), name='webhook_pending_idx'),
         ]
         verbose_name = 'Email Webhook'
         verbose_name_plural = 'Email Webhooks'
@@ -152,18 +154,25 @@ class EmailAutomation(models.Model):
     class Meta:
         db_table = 'email_automations'
         ordering = ['-priority', 'name']
+        indexes = [
+            models.Index(fields=['status'], condition=models.Q(is_active=True), name='emailauto_active_status_idx'),
+        ]
         verbose_name = 'Email Automation'
         verbose_name_plural = 'Email Automations'
     
     def __str__(self):
         return self.name
     
-    def soft_delete(self):
+    def soft_delete(self, user=None):
         """Soft delete the automation"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.is_active = False
-        self.save(update_fields=['is_deleted', 'deleted_at', 'is_active'])
+        update_fields = ['is_deleted', 'deleted_at', 'is_active']
+        if user is not None:
+            self.deleted_by = user
+            update_fields.append('deleted_by')
+        self.save(update_fields=update_fields)
 
 
 class EmailAutomationLog(models.Model):
@@ -201,6 +210,10 @@ class EmailAutomationLog(models.Model):
     class Meta:
         db_table = 'email_automation_logs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['automation', '-created_at', '-id']),
+            models.Index(fields=['created_at'], name='emailauto_log_created_idx'),
+        ]
         verbose_name = 'Email Automation Log'
         verbose_name_plural = 'Email Automation Logs'
     
@@ -268,12 +281,16 @@ class EmailIntegration(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_integration_type_display()})"
     
-    def soft_delete(self):
+    def soft_delete(self, user=None):
         """Soft delete the integration"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.status = 'inactive'
-        self.save(update_fields=['is_deleted', 'deleted_at', 'status'])
+        update_fields = ['is_deleted', 'deleted_at', 'status']
+        if user is not None:
+            self.deleted_by = user
+            update_fields.append('deleted_by')
+        self.save(update_fields=update_fields)
 
 
 class EmailSLA(models.Model):
@@ -335,12 +352,16 @@ class EmailSLA(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_priority_display()})"
     
-    def soft_delete(self):
+    def soft_delete(self, user=None):
         """Soft delete the SLA"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.is_active = False
-        self.save(update_fields=['is_deleted', 'deleted_at', 'is_active'])
+        update_fields = ['is_deleted', 'deleted_at', 'is_active']
+        if user is not None:
+            self.deleted_by = user
+            update_fields.append('deleted_by')
+        self.save(update_fields=update_fields)
 
 
 class EmailTemplateVariable(models.Model):
@@ -394,12 +415,16 @@ class EmailTemplateVariable(models.Model):
     def __str__(self):
         return f"{{{{{self.name}}}}}"
     
-    def soft_delete(self):
+    def soft_delete(self, user=None):
         """Soft delete the template variable"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.is_active = False
-        self.save(update_fields=['is_deleted', 'deleted_at', 'is_active'])
+        update_fields = ['is_deleted', 'deleted_at', 'is_active']
+        if user is not None:
+            self.deleted_by = user
+            update_fields.append('deleted_by')
+        self.save(update_fields=update_fields)
 
 
 class EmailIntegrationAnalytics(models.Model):
@@ -27,6 +27,16 @@ class EmailWebhookSerializer(serializers.ModelSerializer):
         ]
 
 
+class EmailWebhookListSerializer(EmailWebhookSerializer):
+    """List serializer for EmailWebhook, without the raw/processed payloads"""
+    
+    class Meta(EmailWebhookSerializer.Meta):
+        fields = [
+            field for field in EmailWebhookSerializer.Meta.fields
+            if field not in ('raw_data', 'processed_data')
+        ]
+
+
 class EmailAutomationSerializer(serializers.ModelSerializer):
     """Serializer for EmailAutomation"""
     
@@ -84,6 +94,16 @@ class EmailAutomationLogSerializer(serializers.ModelSerializer):
         ]
 
 
+class EmailAutomationLogListSerializer(EmailAutomationLogSerializer):
+    """List serializer for EmailAutomationLog, without result payloads and error text"""
+    
+    class Meta(EmailAutomationLogSerializer.Meta):
+        fields = [
+            field for field in EmailAutomationLogSerializer.Meta.fields
+            if field not in ('result_data', 'error_message')
+        ]
+
+
 class EmailIntegrationSerializer(serializers.ModelSerializer):
     """Serializer for EmailIntegration"""
     
@@ -217,6 +237,18 @@ class WebhookProcessSerializer(serializers.Serializer):
     force_process = serializers.BooleanField(default=False)
 
 
+class WebhookBulkReprocessSerializer(serializers.Serializer):
+    """Serializer for reprocessing several webhooks at once"""
+    
+    webhook_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """Serializer for soft deleting several records at once"""
+    
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+
 class AutomationExecuteSerializer(serializers.Serializer):
     """Serializer for executing automations"""
     
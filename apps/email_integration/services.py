@@ -3,7 +3,7 @@ import requests
 import json
 from typing import List, Dict, Any, Optional
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, F, Count, Avg
 from datetime import timedelta
 import uuid
 
@@ -104,19 +104,7 @@ class EmailIntegrationService:
                 raw_data=raw_data
             )
             
-            processed_data = self._process_webhook_data(provider, event_type, raw_data)
-            webhook.processed_data = processed_data
-            
-            if processed_data.get('email_message_id'):
-                webhook.email_message_id = processed_data['email_message_id']
-                webhook.provider_message_id = processed_data.get('provider_message_id')
-                webhook.event_time = processed_data.get('event_time')
-                
-                self._update_email_status_from_webhook(webhook, processed_data)
-            
-            webhook.status = 'processed'
-            webhook.processed_at = timezone.now()
-            webhook.save()
+            self.process_stored_webhook(webhook)
             
             return {
                 'success': True,
@@ -137,6 +125,23 @@ class EmailIntegrationService:
                 'message': f'Error processing webhook: {str(e)}'
             }
     
+    def process_stored_webhook(self, webhook: EmailWebhook):
+        """Process an already-stored webhook in place. Errors propagate to the caller."""
+        processed_data = self._process_webhook_data(webhook.provider, webhook.event_type, webhook.raw_data)
+        webhook.processed_data = processed_data
+        
+        if processed_data.get('email_message_id'):
+            webhook.email_message_id = processed_data['email_message_id']
+            webhook.provider_message_id = processed_data.get('provider_message_id')
+            webhook.event_time = processed_data.get('event_time')
+            
+            self._update_email_status_from_webhook(webhook, processed_data)
+        
+        webhook.status = 'processed'
+        webhook.processed_at = timezone.now()
+        webhook.error_message = None
+        webhook.save()
+    
     def _process_incoming_email_data(self, provider: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process incoming email data based on provider"""
         try:
@@ -351,9 +356,10 @@ class EmailIntegrationService:
             log.save()
             
             # Update automation
-            automation.execution_count += 1
-            automation.last_executed = timezone.now()
-            automation.save()
+            EmailAutomation.objects.filter(pk=automation.pk).update(
+                execution_count=F('execution_count') + 1,
+                last_executed=timezone.now()
+            )
             
             return result
             
@@ -699,7 +705,7 @@ class EmailIntegrationService:
                 integration.last_error = None
             else:
                 integration.status = 'error'
-                integration.error_count += 1
+                integration.error_count = F('error_count') + 1
                 integration.last_error = result.get('message', 'Unknown error')
             
             integration.save()
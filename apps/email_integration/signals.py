@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import EmailAutomation, EmailAutomationLog, EmailSLA, EmailIntegrationAnalytics
+from .utils import invalidate_stats_cache
+
+
+@receiver([post_save, post_delete], sender=EmailAutomation)
+@receiver([post_save, post_delete], sender=EmailAutomationLog)
+@receiver([post_save, post_delete], sender=EmailSLA)
+@receiver([post_save, post_delete], sender=EmailIntegrationAnalytics)
+def invalidate_statistics(sender, **kwargs):
+    invalidate_stats_cache()
@@ -0,0 +1,66 @@
+import logging
+
+from celery import shared_task
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailWebhook, EmailAutomationLog
+from .services import EmailIntegrationService
+from .utils import invalidate_stats_cache
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_QUEUE = 'webhook_queue'
+LOG_PURGE_BATCH_SIZE = 5000
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 5}, queue=WEBHOOK_QUEUE)
+def process_webhook_task(webhook_id):
+    """Process a stored webhook outside the request cycle; failures are retried with backoff."""
+    webhook = EmailWebhook.objects.filter(id=webhook_id).first()
+    if webhook is None:
+        logger.warning("Webhook %s no longer exists, skipping", webhook_id)
+        return
+
+    try:
+        EmailIntegrationService().process_stored_webhook(webhook)
+    except Exception as e:
+        EmailWebhook.objects.filter(id=webhook_id).update(
+            status='failed',
+            error_message=str(e),
+            retry_count=F('retry_count') + 1
+        )
+        raise
+
+
+@shared_task
+def purge_old_automation_logs():
+    """
+    Delete automation logs older than EMAIL_AUTOMATION_LOG_RETENTION_DAYS.
+
+    Rows go in small batches of raw DELETEs so the table is never locked for
+    long and no per-row post_delete signals are sent.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_AUTOMATION_LOG_RETENTION_DAYS)
+    table = connection.ops.quote_name(EmailAutomationLog._meta.db_table)
+    total_deleted = 0
+
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE id IN ("
+                f"SELECT id FROM {table} WHERE created_at < %s LIMIT %s)",
+                [cutoff, LOG_PURGE_BATCH_SIZE]
+            )
+            deleted = cursor.rowcount
+        total_deleted += deleted
+        if deleted < LOG_PURGE_BATCH_SIZE:
+            break
+
+    if total_deleted:
+        invalidate_stats_cache()
+        logger.info("Purged %s email automation logs older than %s", total_deleted, cutoff.date())
+    return total_deleted
@@ -0,0 +1,27 @@
+"""
+Caching helpers for the email integration statistics endpoints, built on
+apps.core.cache.VersionedCache.
+"""
+
+from apps.core.cache import VersionedCache
+
+STATS_CACHE_TIMEOUT = 60  # 1 minute
+TRENDS_CACHE_TIMEOUT = 600  # 10 minutes, analytics rollups change nightly
+
+stats_cache = VersionedCache("emailauto:stats", STATS_CACHE_TIMEOUT)
+
+
+def get_cached_stats(name, query_params, compute, timeout=STATS_CACHE_TIMEOUT):
+    """
+    Return the cached result of compute() for this endpoint and query string.
+    Results carrying an 'error' key are returned but not cached.
+    """
+    return stats_cache.get_or_compute(
+        name, query_params, compute, timeout,
+        should_cache=lambda result: 'error' not in result
+    )
+
+
+def invalidate_stats_cache():
+    """Invalidate all cached statistics. Called from model signals."""
+    stats_cache.invalidate()
@@ -2,11 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, F, Count, Avg, Sum
 from django.utils import timezone
 from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from celery import group
 import json
 import logging
 
@@ -15,56 +18,51 @@ from .models import (
     EmailSLA, EmailTemplateVariable, EmailIntegrationAnalytics
 )
 from .serializers import (
-    EmailWebhookSerializer, EmailAutomationSerializer, EmailAutomationLogSerializer,
+    EmailWebhookSerializer, EmailWebhookListSerializer, EmailAutomationSerializer,
+    EmailAutomationLogSerializer, EmailAutomationLogListSerializer,
     EmailIntegrationSerializer, EmailSLASerializer, EmailTemplateVariableSerializer,
-    EmailIntegrationAnalyticsSerializer, WebhookProcessSerializer, AutomationExecuteSerializer,
+    EmailIntegrationAnalyticsSerializer, WebhookProcessSerializer, WebhookBulkReprocessSerializer,
+    AutomationExecuteSerializer,
     IntegrationSyncSerializer, DynamicTemplateCreateSerializer, EmailScheduleSerializer,
     EmailReminderSerializer, EmailSignatureSerializer, SLAStatisticsSerializer,
     IntegrationStatisticsSerializer
 )
 from .services import EmailIntegrationService
+from .mixins import DateRangeFilterMixin, BulkSoftDeleteMixin
+from .tasks import process_webhook_task
+from .utils import get_cached_stats, TRENDS_CACHE_TIMEOUT
+from apps.core.pagination import CreatedAtCursorPagination
 
 
-class EmailWebhookViewSet(viewsets.ReadOnlyModelViewSet):
+class EmailWebhookViewSet(DateRangeFilterMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing email webhooks"""
     
     queryset = EmailWebhook.objects.all()
     serializer_class = EmailWebhookSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['provider', 'event_type', 'status']
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EmailWebhookListSerializer
+        return super().get_serializer_class()
     
     def get_queryset(self):
         """Filter webhooks based on query parameters"""
         queryset = super().get_queryset()
         
-        # Filter by provider
-        provider = self.request.query_params.get('provider')
-        if provider:
-            queryset = queryset.filter(provider=provider)
-        
-        # Filter by event type
-        event_type = self.request.query_params.get('event_type')
-        if event_type:
-            queryset = queryset.filter(event_type=event_type)
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
+        # Webhook payloads are often 10-100KB; the list view does not show them
+        if self.action == 'list':
+            queryset = queryset.defer('raw_data', 'processed_data')
         
         # Filter by date range
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
-        
-        if start_date:
-            queryset = queryset.filter(created_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__lte=end_date)
+        queryset = self.apply_date_range(queryset)
         
         return queryset.order_by('-created_at')
     
     @action(detail=False, methods=['post'])
     def process(self, request):
-        """Process pending webhooks"""
+        """Queue a pending webhook for processing"""
         serializer = WebhookProcessSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -73,83 +71,74 @@ class EmailWebhookViewSet(viewsets.ReadOnlyModelViewSet):
         webhook_id = serializer.validated_data['webhook_id']
         force_process = serializer.validated_data['force_process']
         
-        try:
-            webhook = EmailWebhook.objects.get(id=webhook_id)
-            
-            if webhook.status != 'pending' and not force_process:
+        webhooks = EmailWebhook.objects.filter(id=webhook_id)
+        if not force_process:
+            webhooks = webhooks.filter(status='pending')
+        
+        # Acknowledge first; the webhook_queue worker does the processing
+        if not webhooks.update(status='queued'):
+            if not EmailWebhook.objects.filter(id=webhook_id).exists():
                 return Response(
-                    {'error': 'Webhook is not pending'},
-                    status=status.HTTP_400_BAD_REQUEST
+                    {'error': 'Webhook not found'},
+                    status=status.HTTP_404_NOT_FOUND
                 )
-            
-            service = EmailIntegrationService()
-            result = service.process_webhook(
-                webhook.provider,
-                webhook.event_type,
-                webhook.raw_data
-            )
-            
-            if result['success']:
-                return Response(result)
-            else:
-                return Response(result, status=status.HTTP_400_BAD_REQUEST)
-                
-        except EmailWebhook.DoesNotExist:
             return Response(
-                {'error': 'Webhook not found'},
-                status=status.HTTP_404_NOT_FOUND
+                {'error': 'Webhook is not pending'},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        
+        process_webhook_task.delay(str(webhook_id))
+        return Response(
+            {'success': True, 'message': 'Webhook queued for processing', 'webhook_id': str(webhook_id)},
+            status=status.HTTP_202_ACCEPTED
+        )
     
     @action(detail=True, methods=['post'])
     def reprocess(self, request, pk=None):
-        """Reprocess a webhook"""
+        """Queue a webhook for reprocessing"""
         webhook = self.get_object()
+        EmailWebhook.objects.filter(id=webhook.id).update(status='queued')
+        process_webhook_task.delay(str(webhook.id))
         
-        service = EmailIntegrationService()
-        result = service.process_webhook(
-            webhook.provider,
-            webhook.event_type,
-            webhook.raw_data
+        return Response(
+            {'success': True, 'message': 'Webhook queued for reprocessing', 'webhook_id': str(webhook.id)},
+            status=status.HTTP_202_ACCEPTED
         )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_reprocess(self, request):
+        """Queue several webhooks for reprocessing as one Celery group"""
+        serializer = WebhookBulkReprocessSerializer(data=request.data)
         
-        if result['success']:
-            return Response(result)
-        else:
-            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        webhook_ids = [
+            str(webhook_id) for webhook_id in EmailWebhook.objects.filter(
+                id__in=serializer.validated_data['webhook_ids']
+            ).values_list('id', flat=True)
+        ]
+        EmailWebhook.objects.filter(id__in=webhook_ids).update(status='queued')
+        group(process_webhook_task.s(webhook_id) for webhook_id in webhook_ids).apply_async()
+        
+        return Response(
+            {'success': True, 'message': f'{len(webhook_ids)} webhooks queued for reprocessing', 'queued': len(webhook_ids)},
+            status=status.HTTP_202_ACCEPTED
+        )
 
 
-class EmailAutomationViewSet(viewsets.ModelViewSet):
+class EmailAutomationViewSet(BulkSoftDeleteMixin, viewsets.ModelViewSet):
     """ViewSet for managing email automations"""
     
     queryset = EmailAutomation.objects.filter(is_deleted=False)
     serializer_class = EmailAutomationSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['status', 'is_active', 'trigger_type', 'action_type']
+    soft_delete_updates = {'is_active': False}
     
     def get_queryset(self):
-        """Filter automations based on query parameters"""
-        queryset = super().get_queryset()
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by active status
-        is_active = self.request.query_params.get('is_active')
-        if is_active is not None:
-            queryset = queryset.filter(is_active=is_active.lower() == 'true')
-        
-        # Filter by trigger type
-        trigger_type = self.request.query_params.get('trigger_type')
-        if trigger_type:
-            queryset = queryset.filter(trigger_type=trigger_type)
-        
-        # Filter by action type
-        action_type = self.request.query_params.get('action_type')
-        if action_type:
-            queryset = queryset.filter(action_type=action_type)
-        
-        return queryset.order_by('-priority', 'name')
+        """Query param filters are applied by filterset_fields"""
+        return super().get_queryset().select_related('created_by', 'updated_by').order_by('-priority', 'name')
     
     def perform_create(self, serializer):
         """Set created_by when creating a new automation"""
@@ -161,9 +150,7 @@ class EmailAutomationViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Soft delete the automation"""
-        instance.soft_delete()
-        instance.deleted_by = self.request.user
-        instance.save(update_fields=['deleted_by'])
+        instance.soft_delete(user=self.request.user)
     
     @action(detail=True, methods=['post'])
     def execute(self, request, pk=None):
@@ -214,129 +201,102 @@ class EmailAutomationViewSet(viewsets.ModelViewSet):
     def logs(self, request, pk=None):
         """Get automation execution logs"""
         automation = self.get_object()
-        logs = EmailAutomationLog.objects.filter(automation=automation).order_by('-created_at')
-        
-        # Apply pagination
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
-        start = (page - 1) * page_size
-        end = start + page_size
-        
-        logs_page = logs[start:end]
-        total_count = logs.count()
+        logs = EmailAutomationLog.objects.filter(
+            automation=automation
+        ).select_related('automation', 'executed_by')
         
+        # Keyset pagination: cheap at any depth, no COUNT(*) unless requested
+        paginator = CreatedAtCursorPagination()
+        logs_page = paginator.paginate_queryset(logs, request, view=self)
         serializer = EmailAutomationLogSerializer(logs_page, many=True)
         
-        return Response({
-            'results': serializer.data,
-            'total_count': total_count,
-            'page': page,
-            'page_size': page_size,
-            'total_pages': (total_count + page_size - 1) // page_size
-        })
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get automation statistics"""
-        queryset = self.get_queryset()
-        
-        # Basic statistics
-        total_automations = queryset.count()
-        active_automations = queryset.filter(is_active=True).count()
-        inactive_automations = queryset.filter(is_active=False).count()
-        
-        # Execution statistics
-        total_executions = queryset.aggregate(
-            total=models.Sum('execution_count')
-        )['total'] or 0
-        
-        # Recent executions
-        recent_executions = EmailAutomationLog.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).count()
-        
-        # Success rate
-        successful_executions = EmailAutomationLog.objects.filter(
-            status='completed',
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).count()
-        
-        total_recent_executions = EmailAutomationLog.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).count()
+        return Response(get_cached_stats(
+            'automations', request.query_params, self._compute_statistics
+        ))
+    
+    def _compute_statistics(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        # Basic and execution statistics in one pass
+        automation_stats = queryset.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            inactive=Count('id', filter=Q(is_active=False)),
+            executions=Sum('execution_count')
+        )
+        total_automations = automation_stats['total']
+        active_automations = automation_stats['active']
+        inactive_automations = automation_stats['inactive']
+        total_executions = automation_stats['executions'] or 0
+        
+        # Recent executions and success rate over the last 30 days
+        now = timezone.now()
+        log_stats = EmailAutomationLog.objects.filter(
+            created_at__gte=now - timedelta(days=30)
+        ).aggregate(
+            recent=Count('id', filter=Q(created_at__gte=now - timedelta(days=7))),
+            successful=Count('id', filter=Q(status='completed')),
+            total=Count('id')
+        )
+        recent_executions = log_stats['recent']
+        successful_executions = log_stats['successful']
+        total_recent_executions = log_stats['total']
         
         success_rate = (successful_executions / total_recent_executions * 100) if total_recent_executions > 0 else 0
         
-        return Response({
+        return {
             'total_automations': total_automations,
             'active_automations': active_automations,
             'inactive_automations': inactive_automations,
             'total_executions': total_executions,
             'recent_executions': recent_executions,
             'success_rate': round(success_rate, 2)
-        })
+        }
 
 
-class EmailAutomationLogViewSet(viewsets.ReadOnlyModelViewSet):
+class EmailAutomationLogViewSet(DateRangeFilterMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing automation logs"""
     
     queryset = EmailAutomationLog.objects.all()
     serializer_class = EmailAutomationLogSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['automation_id', 'status']
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EmailAutomationLogListSerializer
+        return super().get_serializer_class()
     
     def get_queryset(self):
         """Filter logs based on query parameters"""
         queryset = super().get_queryset()
         
-        # Filter by automation
-        automation_id = self.request.query_params.get('automation_id')
-        if automation_id:
-            queryset = queryset.filter(automation_id=automation_id)
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
+        if self.action == 'list':
+            queryset = queryset.defer('result_data', 'error_message')
         
         # Filter by date range
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
+        queryset = self.apply_date_range(queryset)
         
-        if start_date:
-            queryset = queryset.filter(created_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__lte=end_date)
-        
-        return queryset.order_by('-created_at')
+        return queryset.select_related('automation', 'executed_by').order_by('-created_at')
 
 
-class EmailIntegrationViewSet(viewsets.ModelViewSet):
+class EmailIntegrationViewSet(DateRangeFilterMixin, BulkSoftDeleteMixin, viewsets.ModelViewSet):
     """ViewSet for managing email integrations"""
     
     queryset = EmailIntegration.objects.filter(is_deleted=False)
     serializer_class = EmailIntegrationSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['integration_type', 'status', 'sync_enabled']
+    soft_delete_updates = {'status': 'inactive'}
     
     def get_queryset(self):
-        """Filter integrations based on query parameters"""
-        queryset = super().get_queryset()
-        
-        # Filter by integration type
-        integration_type = self.request.query_params.get('integration_type')
-        if integration_type:
-            queryset = queryset.filter(integration_type=integration_type)
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by sync enabled
-        sync_enabled = self.request.query_params.get('sync_enabled')
-        if sync_enabled is not None:
-            queryset = queryset.filter(sync_enabled=sync_enabled.lower() == 'true')
-        
-        return queryset.order_by('name')
+        """Query param filters are applied by filterset_fields"""
+        return super().get_queryset().select_related('created_by', 'updated_by').order_by('name')
     
     def perform_create(self, serializer):
         """Set created_by when creating a new integration"""
@@ -348,9 +308,7 @@ class EmailIntegrationViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Soft delete the integration"""
-        instance.soft_delete()
-        instance.deleted_by = self.request.user
-        instance.save(update_fields=['deleted_by'])
+        instance.soft_delete(user=self.request.user)
     
     @action(detail=True, methods=['post'])
     def sync(self, request, pk=None):
@@ -394,11 +352,14 @@ class EmailIntegrationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get integration statistics"""
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
+        start_date = self._parse_date_param('start_date', as_date=True)
+        end_date = self._parse_date_param('end_date', as_date=True)
         
         service = EmailIntegrationService()
-        stats = service.get_integration_statistics(start_date, end_date)
+        stats = get_cached_stats(
+            'integrations', request.query_params,
+            lambda: service.get_integration_statistics(start_date, end_date)
+        )
         
         if 'error' in stats:
             return Response(stats, status=status.HTTP_400_BAD_REQUEST)
@@ -406,33 +367,18 @@ class EmailIntegrationViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
 
-class EmailSLAViewSet(viewsets.ModelViewSet):
+class EmailSLAViewSet(BulkSoftDeleteMixin, viewsets.ModelViewSet):
     """ViewSet for managing email SLAs"""
     
     queryset = EmailSLA.objects.filter(is_deleted=False)
     serializer_class = EmailSLASerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['sla_type', 'priority', 'is_active']
+    soft_delete_updates = {'is_active': False}
     
     def get_queryset(self):
-        """Filter SLAs based on query parameters"""
-        queryset = super().get_queryset()
-        
-        # Filter by SLA type
-        sla_type = self.request.query_params.get('sla_type')
-        if sla_type:
-            queryset = queryset.filter(sla_type=sla_type)
-        
-        # Filter by priority
-        priority = self.request.query_params.get('priority')
-        if priority:
-            queryset = queryset.filter(priority=priority)
-        
-        # Filter by active status
-        is_active = self.request.query_params.get('is_active')
-        if is_active is not None:
-            queryset = queryset.filter(is_active=is_active.lower() == 'true')
-        
-        return queryset.order_by('priority', 'name')
+        """Query param filters are applied by filterset_fields"""
+        return super().get_queryset().select_related('created_by', 'updated_by').order_by('priority', 'name')
     
     def perform_create(self, serializer):
         """Set created_by when creating a new SLA"""
@@ -444,9 +390,7 @@ class EmailSLAViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Soft delete the SLA"""
-        instance.soft_delete()
-        instance.deleted_by = self.request.user
-        instance.save(update_fields=['deleted_by'])
+        instance.soft_delete(user=self.request.user)
     
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
@@ -471,24 +415,25 @@ class EmailSLAViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get SLA statistics"""
-        queryset = self.get_queryset()
-        
-        # Basic statistics
-        total_slas = queryset.count()
-        active_slas = queryset.filter(is_active=True).count()
-        
-        # SLA performance
-        total_incidents = queryset.aggregate(
-            total=models.Sum('total_incidents')
-        )['total'] or 0
-        
-        met_sla_count = queryset.aggregate(
-            total=models.Sum('met_sla_count')
-        )['total'] or 0
-        
-        breached_sla_count = queryset.aggregate(
-            total=models.Sum('breached_sla_count')
-        )['total'] or 0
+        return Response(get_cached_stats(
+            'slas', request.query_params, self._compute_statistics
+        ))
+    
+    def _compute_statistics(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        sla_stats = queryset.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            incidents=Sum('total_incidents'),
+            met=Sum('met_sla_count'),
+            breached=Sum('breached_sla_count')
+        )
+        total_slas = sla_stats['total']
+        active_slas = sla_stats['active']
+        total_incidents = sla_stats['incidents'] or 0
+        met_sla_count = sla_stats['met'] or 0
+        breached_sla_count = sla_stats['breached'] or 0
         
         # Calculate overall SLA performance
         if total_incidents > 0:
@@ -496,14 +441,14 @@ class EmailSLAViewSet(viewsets.ModelViewSet):
         else:
             sla_performance = 100
         
-        return Response({
+        return {
             'total_slas': total_slas,
             'active_slas': active_slas,
             'total_incidents': total_incidents,
             'met_sla_count': met_sla_count,
             'breached_sla_count': breached_sla_count,
             'sla_performance': round(sla_performance, 2)
-        })
+        }
 
 
 class EmailTemplateVariableViewSet(viewsets.ModelViewSet):
@@ -512,27 +457,11 @@ class EmailTemplateVariableViewSet(viewsets.ModelViewSet):
     queryset = EmailTemplateVariable.objects.filter(is_deleted=False)
     serializer_class = EmailTemplateVariableSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['variable_type', 'is_active', 'is_system']
     
     def get_queryset(self):
-        """Filter template variables based on query parameters"""
-        queryset = super().get_queryset()
-        
-        # Filter by variable type
-        variable_type = self.request.query_params.get('variable_type')
-        if variable_type:
-            queryset = queryset.filter(variable_type=variable_type)
-        
-        # Filter by active status
-        is_active = self.request.query_params.get('is_active')
-        if is_active is not None:
-            queryset = queryset.filter(is_active=is_active.lower() == 'true')
-        
-        # Filter by system variables
-        is_system = self.request.query_params.get('is_system')
-        if is_system is not None:
-            queryset = queryset.filter(is_system=is_system.lower() == 'true')
-        
-        return queryset.order_by('name')
+        """Query param filters are applied by filterset_fields"""
+        return super().get_queryset().select_related('created_by', 'updated_by').order_by('name')
     
     def perform_create(self, serializer):
         """Set created_by when creating a new template variable"""
@@ -544,9 +473,7 @@ class EmailTemplateVariableViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Soft delete the template variable"""
-        instance.soft_delete()
-        instance.deleted_by = self.request.user
-        instance.save(update_fields=['deleted_by'])
+        instance.soft_delete(user=self.request.user)
     
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
@@ -572,9 +499,12 @@ class EmailTemplateVariableViewSet(viewsets.ModelViewSet):
     def increment_usage(self, request, pk=None):
         """Increment usage count for a template variable"""
         variable = self.get_object()
-        variable.usage_count += 1
-        variable.last_used = timezone.now()
-        variable.save(update_fields=['usage_count', 'last_used'])
+        # Increment in the database so concurrent calls do not lose updates
+        EmailTemplateVariable.objects.filter(pk=variable.pk).update(
+            usage_count=F('usage_count') + 1,
+            last_used=timezone.now()
+        )
+        variable.refresh_from_db(fields=['usage_count', 'last_used'])
         
         return Response({
             'message': 'Usage count incremented',
@@ -583,53 +513,50 @@ class EmailTemplateVariableViewSet(viewsets.ModelViewSet):
         })
 
 
-class EmailIntegrationAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
+class EmailIntegrationAnalyticsViewSet(DateRangeFilterMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing integration analytics"""
     
     queryset = EmailIntegrationAnalytics.objects.all()
     serializer_class = EmailIntegrationAnalyticsSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = ['period_type']
     
     def get_queryset(self):
         """Filter analytics based on query parameters"""
         queryset = super().get_queryset()
         
         # Filter by date range
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
-        
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-        
-        # Filter by period type
-        period_type = self.request.query_params.get('period_type')
-        if period_type:
-            queryset = queryset.filter(period_type=period_type)
+        queryset = self.apply_date_range(queryset, field='date', as_date=True)
         
         return queryset.order_by('-date')
     
     @action(detail=False, methods=['get'])
     def trends(self, request):
         """Get analytics trends"""
-        queryset = self.get_queryset()
-        
-        # Get trends for the last 30 days
-        trends = queryset.filter(
-            date__gte=timezone.now().date() - timedelta(days=30)
-        ).order_by('date')
-        
-        # Group by period type
-        daily_trends = trends.filter(period_type='daily')
-        weekly_trends = trends.filter(period_type='weekly')
-        monthly_trends = trends.filter(period_type='monthly')
-        
-        return Response({
-            'daily_trends': EmailIntegrationAnalyticsSerializer(daily_trends, many=True).data,
-            'weekly_trends': EmailIntegrationAnalyticsSerializer(weekly_trends, many=True).data,
-            'monthly_trends': EmailIntegrationAnalyticsSerializer(monthly_trends, many=True).data
-        })
+        return Response(get_cached_stats(
+            'trends', request.query_params, self._compute_trends,
+            timeout=TRENDS_CACHE_TIMEOUT
+        ))
+    
+    def _compute_trends(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        # Get trends for the last 30 days in one query, grouped by period type
+        rows = queryset.filter(
+            date__gte=timezone.now().date() - timedelta(days=30),
+            period_type__in=['daily', 'weekly', 'monthly']
+        ).order_by('period_type', 'date')
+        grouped = {
+            period_type: list(group)
+            for period_type, group in groupby(rows, key=attrgetter('period_type'))
+        }
+        
+        return {
+            f'{period_type}_trends': EmailIntegrationAnalyticsSerializer(
+                grouped.get(period_type, []), many=True
+            ).data
+            for period_type in ('daily', 'weekly', 'monthly')
+        }
 
 
 @api_view(['POST'])
@@ -1,46 +1,260 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from django.conf import settings
+from django.core.cache import cache
+import asyncio
+import hashlib
 import json
+import logging
+import threading
+from collections import OrderedDict
+import httpx
 
+try:
+    import h2  # noqa: F401  enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+AI_ANALYSIS_CACHE_PREFIX = "ai_sent"
+AI_ANALYSIS_CACHE_TIMEOUT = 86400  # 24 hours
+AI_LOCAL_CACHE_SIZE = 4096  # analyses kept in process memory in front of the shared cache
+AI_ANALYSIS_MAX_CHARS = 4096  # only the start of a long email is sent, and keyed on
+AI_MAX_CONCURRENCY = 20
+AI_ANALYSIS_MAX_TOKENS = 60  # per email; the tool call carries only the three fields
+
+SENTIMENTS = ["positive", "neutral", "negative"]
+INTENTS = ["renewal_request", "complaint", "inquiry", "gratitude", "unsubscribe", "confirmation"]
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sentiment": {"type": "string", "enum": SENTIMENTS},
+        "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+        "intent": {"type": "string", "enum": INTENTS},
+    },
+    "required": ["sentiment", "confidence", "intent"],
+    "additionalProperties": False,
+}
+
+ANALYSIS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_email_analysis",
+        "description": "Record the sentiment and intent of an email.",
+        "parameters": ANALYSIS_SCHEMA,
+        "strict": True,
+    },
+}
+
+BULK_ANALYSIS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_email_analyses",
+        "description": "Record the sentiment and intent of each numbered email.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}, **ANALYSIS_SCHEMA["properties"]},
+                        "required": ["id", *ANALYSIS_SCHEMA["required"]],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+
+# Keep-alive pool shared by every request from this process, so TLS setup is
+# paid once per connection instead of once per call
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
 
 # Safe initialization of OpenAI client
 client = None
 if getattr(settings, "OPENAI_API_KEY", None):
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    except Exception as e:
-        print(f"⚠️ Failed to initialize OpenAI client: {e}")
+        client = OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=DefaultHttpxClient(http2=HTTP2_AVAILABLE, limits=OPENAI_HTTP_LIMITS),
+        )
+    except Exception:
+        logger.exception("Failed to initialize OpenAI client")
         client = None
-else:
-    print("⚠️ OPENAI_API_KEY not set — AI analysis disabled.")
 
+_unavailable_logged = False
+
+
+def ai_available() -> bool:
+    """
+    Whether the OpenAI client is configured. A missing key is logged once,
+    the first time analysis is requested, rather than on every process start.
+    """
+    global _unavailable_logged
+    if client is None and not _unavailable_logged:
+        _unavailable_logged = True
+        logger.warning("OPENAI_API_KEY not set, AI analysis disabled")
+    return client is not None
+
+
+DEFAULT_ANALYSIS = {"sentiment": "neutral (50%)", "intent": "unknown"}
+
+
+_local_analyses = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _analysis_cache_key(text: str) -> str:
+    digest = hashlib.sha256(text[:AI_ANALYSIS_MAX_CHARS].encode('utf-8')).hexdigest()
+    return f"{AI_ANALYSIS_CACHE_PREFIX}:{digest}"
+
+
+def _remember_analysis(key: str, analysis: dict):
+    with _local_lock:
+        _local_analyses[key] = analysis
+        _local_analyses.move_to_end(key)
+        while len(_local_analyses) > AI_LOCAL_CACHE_SIZE:
+            _local_analyses.popitem(last=False)
+
+
+def _get_cached_analysis(text: str):
+    """
+    Return the stored analysis of text, or None. The in-process LRU is checked
+    before the shared cache, so repeats within a worker cost no round trip.
+    """
+    key = _analysis_cache_key(text)
+    with _local_lock:
+        analysis = _local_analyses.get(key)
+        if analysis is not None:
+            _local_analyses.move_to_end(key)
+            return dict(analysis)
+
+    analysis = cache.get(key)
+    if analysis is not None:
+        _remember_analysis(key, analysis)
+        return dict(analysis)
+    return None
 
-def analyze_email_sentiment_and_intent(text: str):
-    try:
-        # If no text, return neutral response
-        if not text:
-            return {"sentiment": "neutral (50%)", "intent": "unknown"}
 
-        # If OpenAI client is not available
-        if client is None:
-            return {"sentiment": "neutral (50%)", "intent": "unknown"}
+def _cache_analysis(text: str, analysis: dict):
+    """Store an analysis in the shared cache and the in-process LRU."""
+    key = _analysis_cache_key(text)
+    cache.set(key, analysis, AI_ANALYSIS_CACHE_TIMEOUT)
+    _remember_analysis(key, dict(analysis))
 
-        prompt = f"""
-        Analyze the following email and provide:
-        1. Sentiment (positive, neutral, negative)
-        2. Confidence score (0–100)
-        3. Intent (renewal_request, complaint, inquiry, gratitude, unsubscribe, confirmation)
 
-        Email:
-        {text}
+def _format_analysis(result: dict) -> dict:
+    return {
+        "sentiment": f"{result.get('sentiment', 'neutral')} ({result.get('confidence', 70)}%)",
+        "intent": result.get("intent", "unknown")
+    }
 
-        Respond strictly in JSON format:
-        {{
-            "sentiment": "positive",
-            "confidence": 87,
-            "intent": "renewal_request"
-        }}
-        """
+
+def request_email_analysis(text: str):
+    """
+    Analyze a single email with OpenAI. API errors propagate so Celery tasks
+    can retry them.
+    """
+    # Identical emails (auto-replies, retries) give identical results
+    cached = _get_cached_analysis(text)
+    if cached is not None:
+        return cached
+
+    response = client.chat.completions.create(**_single_request_kwargs(text))
+    analysis = _parse_single_response(response)
+    _cache_analysis(text, analysis)
+    return analysis
+
+
+def _tool_choice(tool: dict) -> dict:
+    return {"type": "function", "function": {"name": tool["function"]["name"]}}
+
+
+def _tool_arguments(response) -> dict:
+    """
+    Return the arguments of the forced tool call, or {} if the model skipped it.
+    The tools are strict, so the arguments always match their schema.
+    """
+    tool_calls = response.choices[0].message.tool_calls
+    if not tool_calls:
+        return {}
+    return json.loads(tool_calls[0].function.arguments)
+
+
+def _single_request_kwargs(text: str) -> dict:
+    # The output format is carried by the tool schema, not the prompt
+    return {
+        "model": settings.OPENAI_MODEL,
+        "messages": [
+            {"role": "system", "content": "You are an AI email sentiment and intent analyzer."},
+            {"role": "user", "content": f"Analyze the sentiment, confidence and intent of this email:\n\n{text[:AI_ANALYSIS_MAX_CHARS]}"}
+        ],
+        "tools": [ANALYSIS_TOOL],
+        "tool_choice": _tool_choice(ANALYSIS_TOOL),
+        "max_tokens": AI_ANALYSIS_MAX_TOKENS,
+        "temperature": settings.OPENAI_TEMPERATURE,
+    }
+
+
+def _parse_single_response(response) -> dict:
+    return _format_analysis(_tool_arguments(response))
+
+
+def analyze_emails_concurrently(texts: list[str]) -> list[dict]:
+    """
+    Analyze emails one request each, issued in parallel on the async client
+    (at most AI_MAX_CONCURRENCY in flight). Used when batching in one prompt
+    fails. API errors propagate.
+    """
+    async def analyze_async(aclient, semaphore, text):
+        async with semaphore:
+            response = await aclient.chat.completions.create(**_single_request_kwargs(text))
+        return _parse_single_response(response)
+
+    async def run():
+        # A fresh client per event loop; httpx connections cannot cross loops
+        semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+        http_client = DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, limits=OPENAI_HTTP_LIMITS)
+        async with AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client) as aclient:
+            return await asyncio.gather(*[analyze_async(aclient, semaphore, text) for text in texts])
+
+    results = asyncio.run(run())
+    for text, analysis in zip(texts, results):
+        _cache_analysis(text, analysis)
+    return results
+
+
+def analyze_emails_bulk(texts: list[str]) -> list[dict]:
+    """
+    Analyze several emails in one chat.completions call. Returns one result per
+    input text, in order. Cached texts are not resent; API errors propagate.
+    """
+    results = [None] * len(texts)
+    pending = {}
+    for index, text in enumerate(texts):
+        if not text:
+            results[index] = dict(DEFAULT_ANALYSIS)
+            continue
+        cached = _get_cached_analysis(text)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending[index + 1] = text
+
+    if pending:
+        numbered = "\n\n".join(f"Email {number}:\n{text[:AI_ANALYSIS_MAX_CHARS]}" for number, text in pending.items())
+        prompt = (
+            "Analyze the sentiment, confidence and intent of each of the following "
+            f"emails, one result per email number:\n\n{numbered}"
+        )
 
         response = client.chat.completions.create(
             model=settings.OPENAI_MODEL,
@@ -48,24 +262,33 @@ def analyze_email_sentiment_and_intent(text: str):
                 {"role": "system", "content": "You are an AI email sentiment and intent analyzer."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=settings.OPENAI_MAX_TOKENS,
+            tools=[BULK_ANALYSIS_TOOL],
+            tool_choice=_tool_choice(BULK_ANALYSIS_TOOL),
+            max_tokens=AI_ANALYSIS_MAX_TOKENS * len(pending),
             temperature=settings.OPENAI_TEMPERATURE,
         )
 
-        content = response.choices[0].message.content.strip()
-
         try:
-            result = json.loads(content)
-        except json.JSONDecodeError:
-            result = {"sentiment": "neutral", "confidence": 70, "intent": "unknown"}
-
-        sentiment_label = f"{result.get('sentiment', 'neutral')} ({result.get('confidence', 70)}%)"
-        
-        return {
-            "sentiment": sentiment_label,
-            "intent": result.get("intent", "unknown")
-        }
-
-    except Exception as e:
-        print(f"⚠️ AI sentiment analysis error: {e}")
-        return {"sentiment": "neutral (50%)", "intent": "unknown"}
+            parsed = _tool_arguments(response)
+        except ValueError:
+            # A reply cut off at max_tokens is not valid JSON; analyze each email on its own
+            parsed = {}
+        by_id = {item["id"]: item for item in parsed.get("results", [])}
+
+        missing = []
+        for number, text in pending.items():
+            if number in by_id:
+                analysis = _format_analysis(by_id[number])
+                _cache_analysis(text, analysis)
+                results[number - 1] = analysis
+            else:
+                missing.append(number)
+
+        # Emails the batched reply dropped are analyzed individually, in parallel
+        if missing:
+            fallback = analyze_emails_concurrently([pending[number] for number in missing])
+            for number, analysis in zip(missing, fallback):
+                results[number - 1] = analysis
+
+    return results
+
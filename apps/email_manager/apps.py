@@ -6,3 +6,6 @@ class EmailManagerConfig(AppConfig):
     name = 'apps.email_manager'
     verbose_name = 'Email Manager'
 
+
+    def ready(self):
+        import apps.email_manager.signals
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0012_emailmanagerforwardmail_original_email_manager'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailmanagerinbox',
+            name='intent',
+            field=models.CharField(blank=True, help_text='AI-detected intent. Null until analyzed', max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailmanagerinbox',
+            name='sentiment',
+            field=models.CharField(blank=True, help_text="AI sentiment label, e.g. 'positive (87%)'. Null until analyzed", max_length=50, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0013_emailmanagerinbox_intent_emailmanagerinbox_sentiment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=models.Index(condition=models.Q(('email_status__in', ['pending', 'scheduled']), ('schedule_send', True)), fields=['schedule_date_time'], name='em_sched_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0014_emailmanager_em_sched_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailmanager',
+            name='email_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('scheduled', 'Scheduled'), ('queued', 'Queued')], default='pending', help_text='Status of the email', max_length=20),
+        ),
+    ]
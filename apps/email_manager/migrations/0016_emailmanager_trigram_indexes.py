@@ -0,0 +1,44 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:47
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0015_email_status_queued'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['subject'], name='em_subject_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['message'], name='em_message_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['customer_name'], name='em_customer_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['policy_number'], name='em_policy_number_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['to'], name='em_to_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['cc'], name='em_cc_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['bcc'], name='em_bcc_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
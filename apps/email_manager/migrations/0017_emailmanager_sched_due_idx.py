@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0016_emailmanager_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailmanager',
+            name='em_sched_pending_idx',
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=models.Index(condition=models.Q(('email_status__in', ['pending', 'scheduled']), ('is_deleted', False), ('schedule_send', True)), fields=['schedule_date_time'], name='em_sched_due_idx'),
+        ),
+    ]
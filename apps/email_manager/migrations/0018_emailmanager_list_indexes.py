@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0017_emailmanager_sched_due_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailmanager',
+            name='email_manag_schedul_5bd57b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=models.Index(fields=['is_deleted', '-created_at'], name='em_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=models.Index(fields=['is_deleted', 'schedule_send', 'schedule_date_time'], name='em_live_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailmanager',
+            index=models.Index(fields=['is_deleted', 'email_status', '-sent_at'], name='em_live_status_sent_idx'),
+        ),
+    ]
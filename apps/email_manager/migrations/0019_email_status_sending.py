@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0018_emailmanager_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailmanager',
+            name='email_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('scheduled', 'Scheduled'), ('queued', 'Queued'), ('sending', 'Sending')], default='pending', help_text='Status of the email', max_length=20),
+        ),
+    ]
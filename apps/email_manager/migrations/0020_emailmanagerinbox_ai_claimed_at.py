@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0019_email_status_sending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailmanagerinbox',
+            name='ai_claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker claimed this email for AI analysis', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0020_emailmanagerinbox_ai_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailmanager',
+            name='send_claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When the email was last queued or picked up for sending', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 05:33
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_manager', '0021_emailmanager_send_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailmanagerinbox',
+            index=models.Index(django.db.models.functions.text.Lower('message_id'), name='em_inbox_msgid_lower_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 from apps.core.models import BaseModel
 from apps.templates.models import Template
 
@@ -98,6 +101,8 @@ class EmailManager(BaseModel):
             ('sent', 'Sent'),
             ('failed', 'Failed'),
             ('scheduled', 'Scheduled'),
+            ('queued', 'Queued'),
+            ('sending', 'Sending'),
         ],
         default='pending',
         help_text="Status of the email"
@@ -107,6 +112,11 @@ class EmailManager(BaseModel):
         null=True,
         help_text="Date and time when email was sent"
     )
+    send_claimed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When the email was last queued or picked up for sending"
+    )
     error_message = models.TextField(
         blank=True,
         null=True,
@@ -145,16 +155,36 @@ class EmailManager(BaseModel):
             models.Index(fields=['to']),
             models.Index(fields=['policy_number']),
             models.Index(fields=['priority']),
-            models.Index(fields=['schedule_send', 'schedule_date_time']),
             models.Index(fields=['email_status']),
             models.Index(fields=['template']),
             models.Index(fields=['created_at']),
             models.Index(fields=['message_id']),
+            # List endpoints: get_queryset, scheduled_emails and sent_emails
+            models.Index(fields=['is_deleted', '-created_at'], name='em_live_created_idx'),
+            models.Index(fields=['is_deleted', 'schedule_send', 'schedule_date_time'], name='em_live_schedule_idx'),
+            models.Index(fields=['is_deleted', 'email_status', '-sent_at'], name='em_live_status_sent_idx'),
+            # Matches send_scheduled_emails(): only rows still waiting to go out
+            models.Index(
+                fields=['schedule_date_time'],
+                condition=models.Q(schedule_send=True, is_deleted=False, email_status__in=['pending', 'scheduled']),
+                name='em_sched_due_idx'
+            ),
+            # Trigram indexes let the icontains (ILIKE '%x%') filters in the list view use an index
+            GinIndex(fields=['subject'], name='em_subject_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['message'], name='em_message_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['customer_name'], name='em_customer_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['policy_number'], name='em_policy_number_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['to'], name='em_to_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['cc'], name='em_cc_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['bcc'], name='em_bcc_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
         return f"Email to {self.to} - {self.subject}"
 
+    def is_scheduled_for_future(self):
+        return bool(self.schedule_date_time) and timezone.now() < self.schedule_date_time
+
 class EmailManagerInbox(BaseModel):
     from_email = models.EmailField(
         max_length=255,
@@ -219,6 +249,23 @@ class EmailManagerInbox(BaseModel):
         default=False,
         help_text="Indicates whether processing for this inbox email has started"
     )
+    sentiment = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        help_text="AI sentiment label, e.g. 'positive (87%)'. Null until analyzed"
+    )
+    intent = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        help_text="AI-detected intent. Null until analyzed"
+    )
+    ai_claimed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When a worker claimed this email for AI analysis"
+    )
 
 
     class Meta:
@@ -228,6 +275,8 @@ class EmailManagerInbox(BaseModel):
             models.Index(fields=['from_email']),
             models.Index(fields=['to_email']),
             models.Index(fields=['received_at']),
+            # The poll dedupes Message-IDs case-insensitively
+            models.Index(Lower('message_id'), name='em_inbox_msgid_lower_idx'),
         ]
 
     def __str__(self):
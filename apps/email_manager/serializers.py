@@ -1,13 +1,47 @@
 from rest_framework import serializers
 import re
 import html
+from django.db.models import BigIntegerField, Case, OuterRef, Subquery, When
+from django.db.models.functions import Cast
 from .models import EmailManager
 from apps.templates.models import Template
+from apps.templates.utils import get_template
 from apps.customer_payment_schedule.models import PaymentSchedule
 from .models import EmailManagerInbox
 from django.utils.html import strip_tags
 from .models import EmailReply, StartedReplyMail, EmailManagerForwardMail
 
+_LINE_BREAK_TAG_RE = re.compile(r'<br\s*/?>|</p>')
+_NEWLINES_RE = re.compile(r'\n+')
+_BR_RUN_RE = re.compile(r'(?:<br>|\r\n?|\n)+')
+_TAG_RE = re.compile(r'</?[a-zA-Z!][^>]*>')
+
+# Earliest instalment first, with the pk as a tiebreak so every due date
+# lookup (annotation or per-row fallback) picks the same row
+DUE_DATE_ORDERING = ('due_date', 'installment_number', 'id')
+
+# Policy numbers that can name a renewal case id: ASCII digits that fit a bigint
+CASE_ID_PATTERN = re.compile(r'^[0-9]{1,18}$')
+
+# Fields a client may set when creating or updating an email
+EMAIL_MANAGER_EDITABLE_FIELDS = [
+    'to',
+    'cc',
+    'bcc',
+    'subject',
+    'message',
+    'policy_number',
+    'customer_name',
+    'renewal_date',
+    'premium_amount',
+    'priority',
+    'schedule_send',
+    'schedule_date_time',
+    'track_opens',
+    'track_clicks',
+    'template',
+]
+
 
 class EmailManagerSerializer(serializers.ModelSerializer):
     
@@ -43,35 +77,49 @@ class EmailManagerSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_by', 'updated_by', 'created_at', 'updated_at', 'email_status', 'sent_at', 'error_message', 'message_id']
 
 
+class EmailManagerValuesSerializer(EmailManagerSerializer):
+    """
+    EmailManagerSerializer for rows from .values(*Meta.fields). Foreign keys
+    arrive as raw ids, so they are passed through as the related fields would
+    render them.
+    """
+    template = serializers.ReadOnlyField()
+    created_by = serializers.ReadOnlyField()
+    updated_by = serializers.ReadOnlyField()
+
+
+class CachedTemplateField(serializers.PrimaryKeyRelatedField):
+    """
+    Template pk field validated against the shared template cache instead of
+    the DB. Validation never touches the queryset, so it is not cloned per call.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Template.objects.only('pk'))
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_null', True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return get_template(data)
+        except Template.DoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
 class EmailManagerCreateSerializer(serializers.ModelSerializer):
-    template = serializers.PrimaryKeyRelatedField(
-        queryset=Template.objects.all(),
-        required=False,
-        allow_null=True
-    )
+    template = CachedTemplateField()
 
     class Meta:
         model = EmailManager
-        fields = [
-            'to',
-            'cc',
-            'bcc',
-            'subject',
-            'message',
-            'policy_number',
-            'customer_name',
-            'renewal_date',
-            'premium_amount',
-            'priority',
-            'schedule_send',
-            'schedule_date_time',
-            'track_opens',
-            'track_clicks',
-            'template',
-        ]
+        fields = EMAIL_MANAGER_EDITABLE_FIELDS
 
     def validate_schedule_date_time(self, value):
-        if self.initial_data.get('schedule_send') and not value:
+        if value:
+            return value
+        if self.initial_data.get('schedule_send'):
             raise serializers.ValidationError(
                 "Schedule date and time must be provided when schedule_send is True."
             )
@@ -95,40 +143,32 @@ class EmailManagerCreateSerializer(serializers.ModelSerializer):
 
 
 class EmailManagerUpdateSerializer(serializers.ModelSerializer):
+    template = CachedTemplateField()
     
     class Meta:
         model = EmailManager
-        fields = [
-            'to',
-            'cc',
-            'bcc',
-            'subject',
-            'message',
-            'policy_number',
-            'customer_name',
-            'renewal_date',
-            'premium_amount',
-            'priority',
-            'schedule_send',
-            'schedule_date_time',
-            'track_opens',
-            'track_clicks',
-            'template',
-        ]
+        fields = EMAIL_MANAGER_EDITABLE_FIELDS
     
     def validate_schedule_date_time(self, value):
-        schedule_send = self.initial_data.get('schedule_send')
-        if schedule_send and not value:
-            if self.instance:
-                if self.instance.schedule_send and not value:
-                    raise serializers.ValidationError(
-                        "Schedule date and time must be provided when schedule_send is True."
-                    )
+        if value:
+            return value
+        if self.instance and self.instance.schedule_send and self.initial_data.get('schedule_send'):
+            raise serializers.ValidationError(
+                "Schedule date and time must be provided when schedule_send is True."
+            )
         return value
     
     def validate(self, data):
-        schedule_send = data.get('schedule_send', self.instance.schedule_send if self.instance else False)
-        schedule_date_time = data.get('schedule_date_time', self.instance.schedule_date_time if self.instance else None)
+        instance = self.instance
+        # Fall back to the stored values only for fields this request omits
+        if 'schedule_send' in data:
+            schedule_send = data['schedule_send']
+        else:
+            schedule_send = instance.schedule_send if instance else False
+        if 'schedule_date_time' in data:
+            schedule_date_time = data['schedule_date_time']
+        else:
+            schedule_date_time = instance.schedule_date_time if instance else None
         
         if schedule_send and not schedule_date_time:
             raise serializers.ValidationError({
@@ -165,14 +205,37 @@ class SentEmailListSerializer(serializers.ModelSerializer):
             'message_preview', 
         ]
 
+    @staticmethod
+    def annotate_due_date(queryset):
+        """
+        Annotate each email with due_date_annot, the first PaymentSchedule due
+        date of the renewal case named by its policy number, in the same query.
+        """
+        # Only numeric policy numbers can match a renewal case id; the CASE
+        # guard keeps Postgres from casting the others
+        queryset = queryset.annotate(
+            policy_case_id=Case(
+                When(policy_number__regex=CASE_ID_PATTERN.pattern, then=Cast('policy_number', BigIntegerField())),
+                output_field=BigIntegerField()
+            )
+        )
+        due_dates = PaymentSchedule.objects.filter(
+            renewal_case_id=OuterRef('policy_case_id')
+        ).order_by(*DUE_DATE_ORDERING).values('due_date')[:1]
+        return queryset.annotate(due_date_annot=Subquery(due_dates))
+
     def get_due_date(self, obj):
-        try:
-            payment = PaymentSchedule.objects.filter(
-                renewal_case_id=obj.policy_number
-            ).first()
-            return payment.due_date if payment else None
-        except Exception:
+        if hasattr(obj, 'due_date_annot'):
+            return obj.due_date_annot
+        # Only policy numbers that fit a bigint case id can match, as in annotate_due_date
+        if not (obj.policy_number and CASE_ID_PATTERN.fullmatch(obj.policy_number)):
             return None
+        case_id = int(obj.policy_number)
+
+        payment = PaymentSchedule.objects.filter(
+            renewal_case_id=case_id
+        ).order_by(*DUE_DATE_ORDERING).first()
+        return payment.due_date if payment else None
 
     def get_message_html(self, obj):
         """Convert text message into simple HTML <br> format."""
@@ -182,12 +245,13 @@ class SentEmailListSerializer(serializers.ModelSerializer):
 
     def get_message_preview(self, obj):
         raw = obj.message or ""
-        raw = strip_tags(raw)
+        # Sent messages are written in this app, so a single-pass tag regex is
+        # enough; inbox bodies from outside keep using strip_tags
+        raw = _TAG_RE.sub("", raw)
         return raw[:120] + "..." if len(raw) > 120 else raw
 
 class EmailManagerInboxSerializer(serializers.ModelSerializer):
     message = serializers.SerializerMethodField()
-    html_message = serializers.SerializerMethodField()
     clean_text = serializers.SerializerMethodField()
     class Meta:
         model = EmailManagerInbox
@@ -208,27 +272,24 @@ class EmailManagerInboxSerializer(serializers.ModelSerializer):
             'updated_at',
             'is_deleted',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'html_message', 'created_at', 'updated_at']
 
     def get_message(self, obj):
         if not obj.message:
             return None
         text = html.unescape(obj.message)
-        text = text.replace("\r\n", "<br>").replace("\r", "<br>").replace("\n", "<br>")
-        while "<br><br>" in text:
-            text = text.replace("<br><br>", "<br>")
+        # Every run of line breaks and <br> tags becomes a single <br>
+        text = _BR_RUN_RE.sub("<br>", text)
 
         return text.strip()
 
 
-    def get_html_message(self, obj):
-        return obj.html_message
-    
     def get_clean_text(self, obj):
         content = obj.html_message or obj.message or ""
-        content = content.replace("<br>", "\n").replace("</p>", "\n").replace("<p>", "")
+        # Opening <p> tags are removed by strip_tags
+        content = _LINE_BREAK_TAG_RE.sub("\n", content)
         clean = strip_tags(content)
-        clean = re.sub(r'\n+', '\n', clean).strip()
+        clean = _NEWLINES_RE.sub("\n", clean).strip()
         return clean
 
         
@@ -256,7 +317,38 @@ class EmailReplyStatusUpdateSerializer(serializers.ModelSerializer):
 class StartedReplyMailSerializer(serializers.ModelSerializer):
     class Meta:
         model = StartedReplyMail
-        fields = "__all__"
+        fields = [
+            'id',
+            'created_at',
+            'updated_at',
+            'is_deleted',
+            'deleted_at',
+            'to_email',
+            'cc',
+            'bcc',
+            'from_email',
+            'subject',
+            'message',
+            'html_message',
+            'attachments',
+            'track_opens',
+            'track_clicks',
+            'priority',
+            'schedule_send',
+            'schedule_date_time',
+            'message_id',
+            'in_reply_to',
+            'references',
+            'status',
+            'sent_at',
+            'error_message',
+            'deleted_by',
+            'created_by',
+            'updated_by',
+            'original_email_manager',
+            'original_inbox_email',
+            'template',
+        ]
         read_only_fields = ["id", "created_by", "created_at", "updated_at"]
 
 class EmailForwardSerializer(serializers.Serializer):
@@ -269,5 +361,29 @@ class EmailForwardSerializer(serializers.Serializer):
 class EmailManagerForwardMailSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmailManagerForwardMail
-        fields = "__all__"
+        fields = [
+            'id',
+            'created_at',
+            'updated_at',
+            'is_deleted',
+            'deleted_at',
+            'forward_to',
+            'cc',
+            'bcc',
+            'from_email',
+            'subject',
+            'message',
+            'html_message',
+            'attachments',
+            'message_id',
+            'sent_at',
+            'status',
+            'error_message',
+            'deleted_by',
+            'created_by',
+            'updated_by',
+            'original_inbox_email',
+            'template',
+            'original_email_manager',
+        ]
         read_only_fields = ["id", "sent_at", "created_at", "updated_at", "status"]
@@ -1,21 +1,74 @@
+import email
+import imaplib
 import logging
+import re
 import smtplib
+from email.header import decode_header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import make_msgid
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Any
-from django.core.mail import EmailMultiAlternatives
 from django.conf import settings
-from django.utils import timezone
-from .models import EmailManager
+from django.core.cache import cache
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.db.models.functions import Lower
 from django.template import Template as DjangoTemplate, Context
+from django.template.base import render_value_in_context
+from django.utils import timezone
+from apps.core.imap import imap_pool
 from apps.policies.models import Policy
-from .models import EmailManagerInbox
-import imaplib, email
-from email.header import decode_header
+from .models import EmailManager, EmailManagerInbox
+from .utils import invalidate_list_cache
+
 logger = logging.getLogger(__name__)
-from django.db.models import Q
-from email.utils import make_msgid
-from django.core.mail import EmailMessage
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+
+SCHEDULED_SEND_BATCH_SIZE = 100
+
+IMAP_TIMEOUT = 30
+IMAP_FETCH_LIMIT = 50
+IMAP_INSERT_BATCH_SIZE = 100
+IMAP_LAST_UID_KEY = "email_inbox:last_uid:{}:{}"
+IMAP_MAX_ATTEMPTS = 3  # polls a message may fail in before it is given up on
+_IMAP_UID_RE = re.compile(rb"UID (\d+)")
+
+@lru_cache(maxsize=512)
+def compile_template(source: str) -> DjangoTemplate:
+    """
+    Compile a template string once and reuse it. Renewal templates are sent
+    thousands of times, and parsing dominates rendering for short bodies.
+    """
+    return DjangoTemplate(source)
+
+
+_TEMPLATE_TAG_RE = re.compile(r"\{%|\{#")
+_TEMPLATE_VAR_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+@lru_cache(maxsize=512)
+def _is_plain_substitution(source: str) -> bool:
+    """True when the only template syntax in source is {{ name }} variables."""
+    return (
+        _TEMPLATE_TAG_RE.search(source) is None
+        and len(_TEMPLATE_VAR_RE.findall(source)) == source.count("{{")
+    )
+
+
+def render_template(source: str, context: Dict[str, Any]) -> str:
+    """
+    Render source like Django would. Templates that only substitute plain
+    variables skip parsing; values are localized and escaped by the same
+    helper the engine uses, and missing names render empty.
+    """
+    if _is_plain_substitution(source):
+        render_context = Context(context)
+        return _TEMPLATE_VAR_RE.sub(
+            lambda m: render_value_in_context(context.get(m.group(1), ""), render_context), source
+        )
+    return compile_template(source).render(Context(context))
+
+
 class EmailManagerService:
     @staticmethod
     def parse_email_list(email_string: str) -> List[str]:
@@ -26,131 +79,148 @@ class EmailManagerService:
     
 
     @staticmethod
-    def send_email(email_manager: EmailManager) -> Dict[str, Any]:
-        try:
-            if email_manager.schedule_send and email_manager.schedule_date_time:
-                if timezone.now() < email_manager.schedule_date_time:
-                    return {'success': False, 'message': 'Not time yet'}
-            subject = str(email_manager.subject)
-            message = str(email_manager.message)
-
-            if email_manager.policy_number:
-                try:
-                    policy = Policy.objects.get(policy_number=email_manager.policy_number)
-                    customer = policy.customer
-
-                    context = {
-                        'first_name': customer.first_name,
-                        'last_name': customer.last_name,
-                        'policy_number': policy.policy_number,
-                        'expiry_date': policy.end_date.strftime('%d-%m-%Y') if getattr(policy, 'end_date', None) else 'N/A',
-                        'premium_amount': str(policy.premium_amount),
-                        'customer_name': customer.full_name,
-                        'renewal_date': policy.renewal_date.strftime('%Y-%m-%d') if policy.renewal_date else '',
-                    }
-
-                    subject_template = DjangoTemplate(subject)
-                    message_template = DjangoTemplate(message)
-                    subject = subject_template.render(Context(context))
-                    message = message_template.render(Context(context)) 
-
-                except Policy.DoesNotExist:
-                    logger.warning(f"Policy {email_manager.policy_number} not found. Sending static email.")
-                except Exception as e:
-                    logger.error(f"Error rendering email for {email_manager.id}: {e}")
-
-            # Email fields
-            to_emails = [str(email_manager.to)]
-            cc_emails = EmailManagerService.parse_email_list(str(email_manager.cc or ''))
-            bcc_emails = EmailManagerService.parse_email_list(str(email_manager.bcc or ''))
-            from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com')
-
-            custom_msg_id = make_msgid(domain="nbinteli1001.welleazy.com")
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=message,
-                from_email=from_email,
-                to=to_emails,
-                cc=cc_emails if cc_emails else None,
-                bcc=bcc_emails if bcc_emails else None,
-                headers={'Message-ID': custom_msg_id}  
-            )
-
-            # Send email
-            msg.send(fail_silently=False)
-
-            real_msg_id = custom_msg_id.strip("<>")
-
-            now = timezone.now()
-            EmailManager.objects.filter(id=email_manager.id).update(
-                message_id=real_msg_id,
-                email_status='sent',
-                sent_at=now,
-                error_message=None
-            )
-
-            email_manager.refresh_from_db()
-
-            logger.info(f"✅ Email sent successfully to {email_manager.to} | Message-ID: {real_msg_id}")
-
-            sent_at_value = email_manager.sent_at
-            sent_at_str = sent_at_value.isoformat() if sent_at_value else None
-
-            return {
-                'success': True,
-                'message': 'Email sent successfully',
-                'sent_at': sent_at_str,
-                'message_id': real_msg_id
-            }
-
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"❌ Failed to send email to {email_manager.to}: {error_message}")
+    def deliver(email_manager: EmailManager, connection=None, policies=None) -> str:
+        """
+        Render and send one email over the given SMTP connection (a new one
+        if None). Returns the Message-ID; errors propagate to the caller.
+        policies is an optional {policy_number: Policy} map preloaded by batch
+        callers; without it the policy is looked up here.
+        """
+        subject = str(email_manager.subject)
+        message = str(email_manager.message)
+
+        if email_manager.policy_number:
+            try:
+                if policies is not None:
+                    policy = policies.get(email_manager.policy_number)
+                    if policy is None:
+                        raise Policy.DoesNotExist
+                else:
+                    policy = Policy.objects.select_related('customer').get(
+                        policy_number=email_manager.policy_number
+                    )
+                customer = policy.customer
+
+                context = {
+                    'first_name': customer.first_name,
+                    'last_name': customer.last_name,
+                    'policy_number': policy.policy_number,
+                    'expiry_date': policy.end_date.strftime('%d-%m-%Y') if getattr(policy, 'end_date', None) else 'N/A',
+                    'premium_amount': str(policy.premium_amount),
+                    'customer_name': customer.full_name,
+                    'renewal_date': policy.renewal_date.strftime('%Y-%m-%d') if policy.renewal_date else '',
+                }
+
+                subject = render_template(subject, context)
+                message = render_template(message, context)
+
+            except Policy.DoesNotExist:
+                logger.warning("Policy %s not found. Sending static email.", email_manager.policy_number)
+            except Exception as e:
+                logger.error("Error rendering email for %s: %s", email_manager.id, e)
+
+        # Email fields
+        to_emails = [str(email_manager.to)]
+        cc_emails = EmailManagerService.parse_email_list(str(email_manager.cc)) if email_manager.cc else None
+        bcc_emails = EmailManagerService.parse_email_list(str(email_manager.bcc)) if email_manager.bcc else None
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com')
+
+        custom_msg_id = make_msgid(domain="nbinteli1001.welleazy.com")
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            to=to_emails,
+            cc=cc_emails or None,
+            bcc=bcc_emails or None,
+            headers={'Message-ID': custom_msg_id},
+            connection=connection
+        )
 
-            EmailManager.objects.filter(id=email_manager.id).update(
-                email_status='failed',
-                error_message=error_message
-            )
-            email_manager.refresh_from_db()
+        # Send email
+        msg.send(fail_silently=False)
 
-            return {
-                'success': False,
-                'message': f'Failed to send email: {error_message}',
-                'error': error_message
-            }
+        return custom_msg_id.strip("<>")
 
     @staticmethod
     def send_scheduled_emails() -> Dict[str, Any]:
-        
+        """
+        Send every due scheduled email over one SMTP connection. Rows are
+        streamed in batches of SCHEDULED_SEND_BATCH_SIZE and their statuses
+        written with bulk_update after each batch, so a crash can only resend
+        the batch in flight.
+        """
         try:
             now = timezone.now()
             scheduled_emails = EmailManager.objects.filter(
                 schedule_send=True,
                 schedule_date_time__lte=now,
-                is_deleted=False
-            ).filter(
-                Q(email_status="pending") | Q(email_status="scheduled")
-            )
+                is_deleted=False,
+                email_status__in=['pending', 'scheduled']
+            ).only(
+                'id', 'to', 'cc', 'bcc', 'subject', 'message',
+                'schedule_send', 'schedule_date_time', 'policy_number'
+            ).iterator(chunk_size=SCHEDULED_SEND_BATCH_SIZE)
             
             sent_count = 0
             failed_count = 0
-            
-            for email in scheduled_emails:
-                result = EmailManagerService.send_email(email)
-                if result['success']:
-                    sent_count += 1
-                else:
-                    failed_count += 1
+
+            # Only log in to SMTP when something is actually due
+            batch = list(islice(scheduled_emails, SCHEDULED_SEND_BATCH_SIZE))
+            if not batch:
+                return {
+                    'success': True,
+                    'message': 'Processed 0 scheduled emails',
+                    'sent': 0,
+                    'failed': 0
+                }
+
+            with get_connection() as connection:
+                while batch:
+                    policy_numbers = {email.policy_number for email in batch if email.policy_number}
+                    policies = Policy.objects.select_related('customer').in_bulk(
+                        policy_numbers, field_name='policy_number'
+                    ) if policy_numbers else {}
+
+                    sent, failed = [], []
+
+                    for email in batch:
+                        try:
+                            email.message_id = EmailManagerService.deliver(email, connection, policies)
+                            email.email_status = 'sent'
+                            email.sent_at = timezone.now()
+                            email.error_message = None
+                            sent.append(email)
+                        except Exception as e:
+                            logger.error("❌ Failed to send email to %s: %s", email.to, e)
+                            email.email_status = 'failed'
+                            email.error_message = str(e)
+                            failed.append(email)
+                            # A failed send can leave the session unusable; start a fresh one
+                            # so the rest of the run still shares a single connection
+                            try:
+                                connection.close()
+                                connection.open()
+                            except Exception as reconnect_error:
+                                logger.error("SMTP reconnect failed: %s", reconnect_error)
+
+                    EmailManager.objects.bulk_update(sent, ['message_id', 'email_status', 'sent_at', 'error_message'])
+                    EmailManager.objects.bulk_update(failed, ['email_status', 'error_message'])
+                    invalidate_list_cache()
+                    sent_count += len(sent)
+                    failed_count += len(failed)
+
+                    batch = list(islice(scheduled_emails, SCHEDULED_SEND_BATCH_SIZE))
             
             return {
                 'success': True,
-                'message': f'Processed {scheduled_emails.count()} scheduled emails',
+                'message': f'Processed {sent_count + failed_count} scheduled emails',
                 'sent': sent_count,
                 'failed': failed_count
             }
             
         except Exception as e:
-            logger.error(f"Error processing scheduled emails: {str(e)}")
+            logger.error("Error processing scheduled emails: %s", e)
             return {
                 'success': False,
                 'message': f'Error processing scheduled emails: {str(e)}',
@@ -221,205 +291,304 @@ class EmailInboxService:
             cleaned = raw_id.strip().replace('<', '').replace('>', '').replace('\r', '').replace('\n', '').strip()
             return cleaned
         except Exception as e:
-            logger.error(f"Error cleaning Message-ID: {e}")
+            logger.error("Error cleaning Message-ID: %s", e)
             return None
 
 
+    @staticmethod
+    def decode_part(part):
+        payload = part.get_payload(decode=True)
+        if not payload:
+            return ""
+        try:
+            return payload.decode(part.get_content_charset() or "utf-8", errors="ignore")
+        except LookupError:
+            return payload.decode("utf-8", errors="ignore")
+
     @staticmethod
     def fetch_incoming_emails():
-        IMAP_HOST = getattr(settings, "IMAP_HOST", "imap.gmail.com")
-        IMAP_USER = getattr(settings, "EMAIL_HOST_USER")
-        IMAP_PASS = getattr(settings, "EMAIL_HOST_PASSWORD")
-        IMAP_PORT = int(getattr(settings, "IMAP_PORT", 993))
+        IMAP_HOST = settings.IMAP_HOST
+        IMAP_PORT = settings.IMAP_PORT
+        IMAP_USER = settings.IMAP_USER
+        IMAP_PASS = settings.IMAP_PASSWORD
 
         if not all([IMAP_HOST, IMAP_USER, IMAP_PASS]):
             logger.error("❌ IMAP credentials not configured in settings.")
             return {"success": False, "message": "IMAP credentials missing"}
 
         try:
-            logger.info(f"📥 Connecting to IMAP: {IMAP_HOST}:{IMAP_PORT} as {IMAP_USER}")
-            mail = imaplib.IMAP4_SSL(IMAP_HOST, IMAP_PORT)
-            mail.login(IMAP_USER, IMAP_PASS)
-            mail.select("inbox")
-
-            status, messages = mail.search(None, "ALL")
-            if status != "OK":
-                mail.logout()
-                return {"success": False, "message": "Failed to search inbox"}
-
-            email_ids = messages[0].split()
-            processed = 0
-            skipped = 0
-            linked = 0
-
-            for eid in email_ids[-50:]: 
-                try:
-                    status, msg_data = mail.fetch(eid, "(RFC822)")
-                    if status != "OK":
-                        continue
+            with imap_pool.connection(IMAP_HOST, IMAP_PORT, IMAP_USER, IMAP_PASS, timeout=IMAP_TIMEOUT) as mail:
+                return EmailInboxService._sync_inbox(mail, IMAP_HOST, IMAP_USER)
+        except (imaplib.IMAP4.error, OSError) as e:
+            logger.error("IMAP error: %s", e)
+            return {"success": False, "message": f"IMAP error: {str(e)}"}
+        except Exception as e:
+            logger.error("Unexpected error in fetch_incoming_emails: %s", e, exc_info=True)
+            return {"success": False, "message": f"Sync failed: {str(e)}"}
 
-                    raw_email = msg_data[0][1]
-                    msg = email.message_from_bytes(raw_email)
+    @staticmethod
+    def _new_uids(mail, last_uid):
+        """UIDs above last_uid, oldest first; the newest IMAP_FETCH_LIMIT on a first sync."""
+        if last_uid is None:
+            status, data = mail.uid("search", None, "ALL")
+        else:
+            status, data = mail.uid("search", None, f"UID {last_uid + 1}:*")
+        if status != "OK":
+            return None
 
-                    msg_id = msg.get("Message-ID")
-                    if not msg_id:
-                        logger.debug("⏩ Skipped: No Message-ID header present.")
-                        skipped += 1
-                        continue
+        uids = sorted(int(uid) for uid in data[0].split())
+        if last_uid is None:
+            return uids[-IMAP_FETCH_LIMIT:]
+        # "n:*" still matches the highest UID when nothing newer exists.
+        return [uid for uid in uids if uid > last_uid][:IMAP_FETCH_LIMIT]
 
-                    msg_id_clean = EmailInboxService.clean_message_id(msg_id)
+    @staticmethod
+    def _fetch_by_uid(mail, uids, query):
+        """Run one UID FETCH for all uids and map each UID to its literal data."""
+        if not uids:
+            return {}
+        status, data = mail.uid("fetch", ",".join(str(uid) for uid in uids), query)
+        if status != "OK":
+            return {}
+
+        results = {}
+        for index, item in enumerate(data):
+            if not isinstance(item, tuple):
+                continue
+            # Servers put "UID n" either before the literal or in the bytes that close the response
+            match = _IMAP_UID_RE.search(item[0])
+            if match is None and index + 1 < len(data) and isinstance(data[index + 1], bytes):
+                match = _IMAP_UID_RE.search(data[index + 1])
+            if match:
+                results[int(match.group(1))] = item[1]
+        return results
 
-                    if EmailManagerInbox.objects.filter(message_id__iexact=msg_id_clean).exists():
-                        skipped += 1
+    @staticmethod
+    def _sync_inbox(mail, host, user):
+        from .tasks import queue_pending_analysis
+
+        status, _ = mail.select("inbox")
+        if status != "OK":
+            return {"success": False, "message": "Failed to select inbox"}
+
+        uid_validity = (mail.response("UIDVALIDITY")[1] or [None])[0]
+        uid_validity = uid_validity.decode() if isinstance(uid_validity, bytes) else uid_validity
+        last_uid_key = IMAP_LAST_UID_KEY.format(host, user)
+        cursor = cache.get(last_uid_key) or {}
+        same_mailbox = cursor.get("uid_validity") == uid_validity
+        last_uid = cursor.get("uid") if same_mailbox else None
+        # UIDs whose fetch or processing failed on an earlier poll, with their attempt counts
+        retry = {int(uid): attempts for uid, attempts in cursor.get("retry", {}).items()} if same_mailbox else {}
+
+        uids = EmailInboxService._new_uids(mail, last_uid)
+        if uids is None:
+            return {"success": False, "message": "Failed to search inbox"}
+        uids = sorted(set(uids) | retry.keys())
+
+        processed = 0
+        skipped = 0
+        linked = 0
+
+        failed = set()
+        headers = EmailInboxService._fetch_by_uid(mail, uids, "(BODY.PEEK[HEADER.FIELDS (MESSAGE-ID)])")
+        message_ids = {}
+        for uid in uids:
+            if uid not in headers:
+                failed.add(uid)
+                continue
+            msg_id = email.message_from_bytes(headers.get(uid, b"")).get("Message-ID")
+            if not msg_id:
+                logger.debug("⏩ Skipped: No Message-ID header present.")
+                skipped += 1
+                continue
+            message_ids[uid] = EmailInboxService.clean_message_id(msg_id)
+
+        # Message-IDs are compared case-insensitively, like the per-message iexact check did
+        existing = set(
+            EmailManagerInbox.objects.annotate(message_id_lower=Lower("message_id")).filter(
+                message_id_lower__in={msg_id.lower() for msg_id in message_ids.values()}
+            ).values_list("message_id_lower", flat=True)
+        )
+        new_uids = []
+        for uid, msg_id in message_ids.items():
+            # Adding to existing also drops repeats of one Message-ID within this poll
+            if msg_id.lower() not in existing:
+                existing.add(msg_id.lower())
+                new_uids.append(uid)
+        skipped += len(message_ids) - len(new_uids)
+
+        # Only messages not stored yet are downloaded in full; PEEK leaves them unread.
+        bodies = EmailInboxService._fetch_by_uid(mail, new_uids, "(BODY.PEEK[])")
+        failed.update(uid for uid in new_uids if uid not in bodies)
+        fetched = [
+            (uid, email.message_from_bytes(bodies[uid]), message_ids[uid])
+            for uid in new_uids if uid in bodies
+        ]
+
+        new_rows = []
+        for eid, msg, msg_id_clean in fetched:
+            try:
+                from_ = msg.get("From", "")
+                to_ = msg.get("To", "")
+                subject_raw = msg.get("Subject", "")
+                in_reply_to_raw = msg.get("In-Reply-To")
+                references_raw = msg.get("References")
+
+                subject_parts = decode_header(subject_raw)
+                subject = ""
+                for part, encoding in subject_parts:
+                    if isinstance(part, bytes):
+                        subject += part.decode(encoding or "utf-8", errors="ignore")
+                    else:
+                        subject += part
+                subject = EmailInboxService.clean_text(subject)
+
+                in_reply_to = EmailInboxService.clean_message_id(in_reply_to_raw)
+                references = [
+                    EmailInboxService.clean_message_id(ref)
+                    for ref in references_raw.split()
+                    if ref.strip()
+                ] if references_raw else []
+
+                candidate_ids = []
+                if in_reply_to:
+                    candidate_ids.append(in_reply_to)
+                candidate_ids.extend(references)
+
+                logger.debug("📨 Processing email '%s' | Candidates: %s", subject, candidate_ids)
+
+                related_email = None
+                for mid in candidate_ids:
+                    if not mid:
                         continue
-
-                    from_ = msg.get("From", "")
-                    to_ = msg.get("To", "")
-                    subject_raw = msg.get("Subject", "")
-                    in_reply_to_raw = msg.get("In-Reply-To")
-                    references_raw = msg.get("References")
-
-                    subject_parts = decode_header(subject_raw)
-                    subject = ""
-                    for part, encoding in subject_parts:
-                        if isinstance(part, bytes):
-                            subject += part.decode(encoding or "utf-8", errors="ignore")
-                        else:
-                            subject += part
-                    subject = EmailInboxService.clean_text(subject)
-
-                    in_reply_to = EmailInboxService.clean_message_id(in_reply_to_raw)
-                    references = [
-                        EmailInboxService.clean_message_id(ref)
-                        for ref in references_raw.split()
-                        if ref.strip()
-                    ] if references_raw else []
-
-                    candidate_ids = []
-                    if in_reply_to:
-                        candidate_ids.append(in_reply_to)
-                    candidate_ids.extend(references)
-
-                    logger.debug(f"📨 Processing email '{subject}' | Candidates: {candidate_ids}")
-
-                    related_email = None
-                    for mid in candidate_ids:
-                        if not mid:
-                            continue
-                        normalized_mid = mid.lower().strip().replace("<", "").replace(">", "")
-                        try:
+                    normalized_mid = mid.lower().strip().replace("<", "").replace(">", "")
+                    try:
+                        related_email = EmailManager.objects.filter(
+                            message_id__iexact=normalized_mid,
+                            is_deleted=False
+                        ).first()
+
+                        if not related_email:
                             related_email = EmailManager.objects.filter(
-                                message_id__iexact=normalized_mid,
+                                message_id__icontains=normalized_mid,
                                 is_deleted=False
                             ).first()
 
-                            if not related_email:
-                                related_email = EmailManager.objects.filter(
-                                    message_id__icontains=normalized_mid,
-                                    is_deleted=False
-                                ).first()
-
-                            if not related_email:
-                                related_email = EmailManager.objects.filter(
-                                    message_id__icontains=mid.lower(),
-                                    is_deleted=False
-                                ).first()
-
-                            if related_email:
-                                logger.info(
-                                    f"✅ Linked reply to EmailManager ID={related_email.id}, "
-                                    f"policy={related_email.policy_number}, subject={subject}"
-                                )
-                                linked += 1
-                                break
-                        except Exception as ex:
-                            logger.exception(f"⚠️ Error linking MID {mid}: {ex}")
-                            continue
-
-                    body = ""
-                    html_body = ""
-                    attachments = []
-
-                    if msg.is_multipart():
-                        for part in msg.walk():
-                            content_type = part.get_content_type()
-                            content_disposition = str(part.get("Content-Disposition", ""))
-
-                            if "attachment" in content_disposition:
-                                filename = part.get_filename()
-                                if filename:
-                                    try:
-                                        decoded = decode_header(filename)[0]
-                                        filename = (
-                                            decoded[0]
-                                            if isinstance(decoded[0], str)
-                                            else decoded[0].decode(decoded[1] or "utf-8")
-                                        )
-                                    except Exception:
-                                        filename = filename or "unknown"
-                                    payload = part.get_payload(decode=True)
-                                    attachments.append({
-                                        "filename": filename,
-                                        "size": len(payload) if payload else 0,
-                                        "content_type": content_type,
-                                    })
-                                continue
-
-                            payload = part.get_payload(decode=True)
-                            if not payload:
-                                continue
-                            text = payload.decode(errors="ignore")
-
-                            if content_type == "text/plain" and "attachment" not in content_disposition:
-                                body += text + "\n"
-                            elif content_type == "text/html" and "attachment" not in content_disposition:
-                                html_body += text
-                    else:
-                        payload = msg.get_payload(decode=True)
-                        if payload:
-                            body = payload.decode(errors="ignore")
-
-                    if related_email:
-                        EmailManagerInbox.objects.create(
-                            from_email=from_,
-                            to_email=to_,
-                            subject=subject,
-                            message=EmailInboxService.clean_text(body),
-                            html_message=html_body.strip() or None,
-                            received_at=timezone.now(),
-                            message_id=msg_id_clean,
-                            in_reply_to=in_reply_to or (references[0] if references else None),
-                            references=references_raw,
-                            attachments=attachments if attachments else None,
-                            related_email=related_email,
-                            is_read=False,
-                        )
-                        processed += 1
-                        logger.info(
-                            f"📩 Stored reply from {from_} for policy {related_email.policy_number} | Subject: {subject}"
-                        )
-                    else:
-                        skipped += 1
-                        logger.debug(f"⏩ Skipped unrelated email: {subject} from {from_}")
-
-                except Exception as e:
-                    logger.error(f"Error processing email ID {eid}: {str(e)}", exc_info=True)
-                    continue
+                        if not related_email:
+                            related_email = EmailManager.objects.filter(
+                                message_id__icontains=mid.lower(),
+                                is_deleted=False
+                            ).first()
 
-            mail.logout()
-            logger.info(f"📬 Summary: Processed={processed}, Skipped={skipped}, Linked={linked}")
+                        if related_email:
+                            logger.info(
+                                "✅ Linked reply to EmailManager ID=%s, policy=%s, subject=%s",
+                                related_email.id, related_email.policy_number, subject
+                            )
+                            linked += 1
+                            break
+                    except Exception as ex:
+                        logger.exception("⚠️ Error linking MID %s: %s", mid, ex)
+                        continue
 
-            return {
-                "success": True,
-                "message": "Emails synced successfully",
-                "processed": processed,
-                "skipped": skipped,
-                "linked_replies": linked,
-            }
+                body_parts = []
+                html_parts = []
+                attachments = []
+
+                if msg.is_multipart():
+                    for part in msg.walk():
+                        content_type = part.get_content_type()
+                        content_disposition = str(part.get("Content-Disposition", ""))
+
+                        if "attachment" in content_disposition:
+                            filename = part.get_filename()
+                            if filename:
+                                try:
+                                    decoded = decode_header(filename)[0]
+                                    filename = (
+                                        decoded[0]
+                                        if isinstance(decoded[0], str)
+                                        else decoded[0].decode(decoded[1] or "utf-8")
+                                    )
+                                except Exception:
+                                    filename = filename or "unknown"
+                                payload = part.get_payload(decode=True)
+                                attachments.append({
+                                    "filename": filename,
+                                    "size": len(payload) if payload else 0,
+                                    "content_type": content_type,
+                                })
+                            continue
 
-        except imaplib.IMAP4.error as e:
-            logger.error(f"IMAP error: {e}")
-            return {"success": False, "message": f"IMAP error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Unexpected error in fetch_incoming_emails: {e}", exc_info=True)
-            return {"success": False, "message": f"Sync failed: {str(e)}"}
\ No newline at end of file
+                        if content_type == "text/plain":
+                            text = EmailInboxService.decode_part(part)
+                            if text:
+                                body_parts.append(text + "\n")
+                        elif content_type == "text/html":
+                            html_parts.append(EmailInboxService.decode_part(part))
+                else:
+                    body_parts.append(EmailInboxService.decode_part(msg))
+
+                body = "".join(body_parts)
+                html_body = "".join(html_parts)
+
+                if related_email:
+                    new_rows.append(EmailManagerInbox(
+                        from_email=from_,
+                        to_email=to_,
+                        subject=subject,
+                        message=EmailInboxService.clean_text(body),
+                        html_message=html_body.strip() or None,
+                        received_at=timezone.now(),
+                        message_id=msg_id_clean,
+                        in_reply_to=in_reply_to or (references[0] if references else None),
+                        references=references_raw,
+                        attachments=attachments if attachments else None,
+                        related_email=related_email,
+                        is_read=False,
+                    ))
+                    processed += 1
+                    logger.info(
+                        "📩 Stored reply from %s for policy %s | Subject: %s",
+                        from_, related_email.policy_number, subject
+                    )
+                else:
+                    skipped += 1
+                    logger.debug("⏩ Skipped unrelated email: %s from %s", subject, from_)
+
+            except Exception as e:
+                logger.error("Error processing email ID %s: %s", eid, e, exc_info=True)
+                failed.add(eid)
+                continue
+
+        # message_id is unique, so a reply stored by a concurrent poll is dropped by the database.
+        EmailManagerInbox.objects.bulk_create(new_rows, batch_size=IMAP_INSERT_BATCH_SIZE, ignore_conflicts=True)
+
+        if uids:
+            # The cursor moves past every UID seen; failed ones are retried on the
+            # next polls instead of being skipped for good.
+            retry_next = {}
+            for uid in failed:
+                attempts = retry.get(uid, 0) + 1
+                if attempts < IMAP_MAX_ATTEMPTS:
+                    retry_next[str(uid)] = attempts
+                else:
+                    logger.warning("Giving up on IMAP UID %s after %s attempts", uid, attempts)
+            cache.set(last_uid_key, {
+                "uid_validity": uid_validity,
+                "uid": max(uids[-1], last_uid or 0),
+                "retry": retry_next,
+            }, None)
+
+        logger.info("📬 Summary: Processed=%s, Skipped=%s, Linked=%s", processed, skipped, linked)
+
+        if processed:
+            queue_pending_analysis()
+
+        return {
+            "success": True,
+            "message": "Emails synced successfully",
+            "processed": processed,
+            "skipped": skipped,
+            "linked_replies": linked,
+        }
\ No newline at end of file
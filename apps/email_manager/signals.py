@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import EmailManager
+from .utils import invalidate_list_cache
+
+
+@receiver([post_save, post_delete], sender=EmailManager)
+def invalidate_email_lists(sender, **kwargs):
+    invalidate_list_cache()
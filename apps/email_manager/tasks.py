@@ -1,10 +1,208 @@
+import logging
 from celery import shared_task
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from openai import OpenAIError
+from django.utils import timezone
+from . import ai_utils
+from .models import EmailManager, EmailManagerInbox
 from .services import EmailManagerService, EmailInboxService
+from .utils import invalidate_list_cache
+
+logger = logging.getLogger(__name__)
+
+AI_QUEUE = 'ai_queue'
+AI_QUEUED_KEY = "ai_sent:queued:{}"
+AI_QUEUED_TIMEOUT = 600  # 10 minutes
+AI_BATCH_SIZE = 20
+AI_BATCH_QUEUED_KEY = "ai_sent:queued:batch"
+AI_CLAIM_TIMEOUT = timedelta(minutes=10)
+SEND_EMAIL_RATE_LIMIT = "50/s"  # per worker; keeps bursts under the SMTP relay limits
+IN_FLIGHT_STATUSES = ('queued', 'sending')  # a send is already queued or in progress
+# Longer than the retry backoff cap (10 minutes), so only a claim whose worker
+# or enqueue was lost goes stale
+SEND_CLAIM_TIMEOUT = timedelta(minutes=15)
 
 @shared_task
 def process_scheduled_emails():
     EmailManagerService.send_scheduled_emails()
 
+@shared_task(bind=True, max_retries=5, autoretry_for=(OSError,), retry_backoff=True, rate_limit=SEND_EMAIL_RATE_LIMIT)
+def send_email_task(self, email_id):
+    """Deliver one email off the request thread; SMTP and socket errors are OSErrors and retry."""
+    # Claim the row first so a duplicate task for the same email sends nothing
+    claimed = _update_send_status(
+        EmailManager.objects.filter(id=email_id, is_deleted=False, email_status='queued'),
+        email_status='sending',
+        send_claimed_at=timezone.now()
+    )
+    if not claimed:
+        return
+
+    email_manager = EmailManager.objects.get(id=email_id)
+    rows = EmailManager.objects.filter(id=email_id)
+    try:
+        message_id = EmailManagerService.deliver(email_manager)
+    except Exception as e:
+        # An OSError is retried, so the row goes back to 'queued' for the next attempt
+        will_retry = isinstance(e, OSError) and self.request.retries < self.max_retries
+        logger.error("Failed to send email to %s: %s", email_manager.to, e)
+        _update_send_status(
+            rows,
+            email_manager,
+            email_status='queued' if will_retry else 'failed',
+            send_claimed_at=timezone.now() if will_retry else None,
+            error_message=str(e)
+        )
+        raise
+
+    _update_send_status(
+        rows,
+        email_manager,
+        message_id=message_id,
+        email_status='sent',
+        sent_at=timezone.now(),
+        send_claimed_at=None,
+        error_message=None
+    )
+    logger.info("Email sent to %s | Message-ID: %s", email_manager.to, message_id)
+
+def _update_send_status(rows, email_manager=None, **fields):
+    """
+    Every single-email status change goes through here: one UPDATE on rows,
+    then the cached lists are invalidated. The fields are mirrored on
+    email_manager, if given, instead of refetching it. Returns the row count.
+    """
+    updated = rows.update(**fields)
+    if updated:
+        invalidate_list_cache()
+        if email_manager is not None:
+            for name, value in fields.items():
+                setattr(email_manager, name, value)
+    return updated
+
+def send_in_flight(email_manager):
+    """True if a send for this email is queued or running and its claim has not gone stale."""
+    return (
+        email_manager.email_status in IN_FLIGHT_STATUSES
+        and email_manager.send_claimed_at is not None
+        and email_manager.send_claimed_at > timezone.now() - SEND_CLAIM_TIMEOUT
+    )
+
+def queue_email_send(email_manager):
+    """
+    Mark the email queued and enqueue send_email_task once the row is committed.
+    Returns False, queueing nothing, if the email is already sent or has a live
+    send claim. A claim older than SEND_CLAIM_TIMEOUT is taken over, and if the
+    enqueue itself fails the row goes back to its previous status.
+    """
+    now = timezone.now()
+    previous_status = email_manager.email_status
+    claimed = _update_send_status(
+        EmailManager.objects.filter(id=email_manager.id).exclude(
+            email_status='sent'
+        ).exclude(
+            email_status__in=IN_FLIGHT_STATUSES, send_claimed_at__gt=now - SEND_CLAIM_TIMEOUT
+        ),
+        email_manager,
+        email_status='queued',
+        send_claimed_at=now,
+        error_message=None
+    )
+    if not claimed:
+        return False
+
+    email_id = str(email_manager.id)
+
+    def enqueue():
+        try:
+            send_email_task.delay(email_id)
+        except Exception as e:
+            logger.error("Could not queue email %s for sending: %s", email_id, e)
+            _update_send_status(
+                EmailManager.objects.filter(id=email_id, email_status='queued'),
+                email_status=previous_status,
+                send_claimed_at=None,
+                error_message=str(e)
+            )
+
+    transaction.on_commit(enqueue)
+    return True
+
 @shared_task
 def fetch_and_process_incoming_emails():
     EmailInboxService.fetch_incoming_emails()
+
+@shared_task(max_retries=3, autoretry_for=(OpenAIError,), retry_backoff=True, queue=AI_QUEUE)
+def analyze_inbox_email(inbox_id):
+    """Analyze one inbox email off the request thread and store the result on it."""
+    if not ai_utils.ai_available():
+        return
+
+    email_obj = EmailManagerInbox.objects.filter(id=inbox_id).only('message', 'html_message').first()
+    if email_obj is None:
+        return
+
+    text = (email_obj.message or email_obj.html_message or "").strip()
+    result = ai_utils.request_email_analysis(text) if text else ai_utils.DEFAULT_ANALYSIS
+
+    EmailManagerInbox.objects.filter(id=inbox_id).update(
+        sentiment=result["sentiment"],
+        intent=result["intent"]
+    )
+
+def queue_inbox_analysis(inbox_id):
+    """Enqueue analyze_inbox_email unless the same email was queued recently."""
+    if cache.add(AI_QUEUED_KEY.format(inbox_id), True, AI_QUEUED_TIMEOUT):
+        analyze_inbox_email.delay(inbox_id)
+
+@shared_task(max_retries=3, autoretry_for=(OpenAIError,), retry_backoff=True, queue=AI_QUEUE)
+def analyze_pending_inbox_emails():
+    """
+    Analyze up to AI_BATCH_SIZE unanalyzed inbox emails with a single OpenAI call.
+    Rows are claimed with SKIP LOCKED, so several workers drain the backlog
+    without overlapping.
+    """
+    cache.delete(AI_BATCH_QUEUED_KEY)
+    if not ai_utils.ai_available():
+        return 0
+
+    # Claim a batch in a short transaction; the OpenAI call below runs with no
+    # row locks held. Claims older than AI_CLAIM_TIMEOUT are assumed abandoned.
+    now = timezone.now()
+    with transaction.atomic():
+        pending = list(
+            EmailManagerInbox.objects.select_for_update(skip_locked=True)
+            .filter(sentiment__isnull=True, is_deleted=False)
+            .filter(Q(ai_claimed_at__isnull=True) | Q(ai_claimed_at__lt=now - AI_CLAIM_TIMEOUT))
+            .only('id', 'message', 'html_message')[:AI_BATCH_SIZE]
+        )
+        if not pending:
+            return 0
+        pending_ids = [obj.id for obj in pending]
+        EmailManagerInbox.objects.filter(id__in=pending_ids).update(ai_claimed_at=now)
+
+    texts = [(obj.message or obj.html_message or "").strip() for obj in pending]
+    try:
+        results = ai_utils.analyze_emails_bulk(texts)
+    except Exception:
+        # Release the claim so the retry (or another worker) can pick the batch up
+        EmailManagerInbox.objects.filter(id__in=pending_ids).update(ai_claimed_at=None)
+        raise
+
+    for obj, result in zip(pending, results):
+        obj.sentiment = result["sentiment"]
+        obj.intent = result["intent"]
+    EmailManagerInbox.objects.bulk_update(pending, ['sentiment', 'intent'])
+
+    # A full batch means there may be more waiting
+    if len(pending) == AI_BATCH_SIZE:
+        queue_pending_analysis()
+    return len(pending)
+
+def queue_pending_analysis():
+    """Enqueue analyze_pending_inbox_emails unless a batch run is already queued."""
+    if cache.add(AI_BATCH_QUEUED_KEY, True, AI_QUEUED_TIMEOUT):
+        analyze_pending_inbox_emails.delay()
@@ -1,4 +1,4 @@
-from django.urls import path,include
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from .views import EmailManagerViewSet, EmailManagerInboxViewSet, SyncEmailsView
 
@@ -7,5 +7,5 @@ router.register(r'emails', EmailManagerViewSet, basename='email-manager')
 router.register(r'inbox', EmailManagerInboxViewSet, basename='email-manager-inbox')
 
 urlpatterns = router.urls + [
-    path('', include(router.urls)),
+    path('sync-emails/', SyncEmailsView.as_view(), name='email-manager-sync-emails'),
 ]
@@ -0,0 +1,24 @@
+"""
+Caching helpers for the email manager list endpoints, built on
+apps.core.cache.VersionedCache.
+
+Any write to EmailManager bumps the version: post_save/post_delete do it
+through signals, and the queryset update()/bulk_update() paths call
+invalidate_list_cache().
+"""
+
+from apps.core.cache import VersionedCache
+
+LIST_CACHE_TIMEOUT = 30  # due dates come from payment schedules, which do not invalidate
+
+list_cache = VersionedCache("email_manager:lists", LIST_CACHE_TIMEOUT)
+
+
+def get_cached_list(name, query_params, compute, timeout=LIST_CACHE_TIMEOUT):
+    """Return the cached result of compute() for this endpoint and query string."""
+    return list_cache.get_or_compute(name, query_params, compute, timeout)
+
+
+def invalidate_list_cache():
+    """Invalidate every cached list. Called after any EmailManager write."""
+    list_cache.invalidate()
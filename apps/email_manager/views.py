@@ -1,33 +1,71 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from collections import OrderedDict
 from django.db.models import Q
+from django.http import QueryDict
 from .models import EmailManager, EmailReply, StartedReplyMail,EmailManagerForwardMail
 from .serializers import (
     EmailManagerSerializer,
+    EmailManagerValuesSerializer,
     EmailManagerCreateSerializer,
     EmailManagerUpdateSerializer,
     SentEmailListSerializer,
     EmailReplySerializer,
     EmailForwardSerializer
 )
-from .services import EmailManagerService
+from .services import EmailManagerService, render_template
 from apps.templates.models import Template
+from apps.templates.utils import get_template
 from apps.customer_payment_schedule.models import PaymentSchedule
 from rest_framework.views import APIView
 from .models import EmailManagerInbox
 from .serializers import EmailManagerInboxSerializer
 from .services import EmailInboxService
-from .ai_utils import analyze_email_sentiment_and_intent
+from .ai_utils import DEFAULT_ANALYSIS
+from .utils import get_cached_list
+from .tasks import queue_email_send, send_in_flight, queue_inbox_analysis, queue_pending_analysis
 from django.db.models import Count, Avg, F, ExpressionWrapper, DurationField
-from .ai_utils import analyze_email_sentiment_and_intent
-from django.template import Template as DjangoTemplate, Context
 from email.utils import make_msgid
 from django.core.mail import EmailMultiAlternatives
 from django.utils import timezone
 from django.utils.html import strip_tags
 from apps.policies.models import Policy
 
+# Columns Customer.full_name reads; lets policy lookups defer the rest of the customer row
+CUSTOMER_NAME_FIELDS = ('customer__customer_type', 'customer__first_name', 'customer__last_name', 'customer__company_name')
+
+# Query params EmailManagerViewSet.get_queryset maps straight onto lookups
+EMAIL_MANAGER_FILTER_PARAMS = {
+    'policy_number': 'policy_number__icontains',
+    'customer_name': 'customer_name__icontains',
+    'priority': 'priority',
+    'email_status': 'email_status',
+}
+EMAIL_MANAGER_BOOLEAN_PARAMS = ('schedule_send', 'track_opens', 'track_clicks')
+
+PRIORITY_OPTIONS = tuple(
+    {'value': value, 'label': label} for value, label in EmailManager.PRIORITY_CHOICES
+)
+
+
+def editable_request_data(request):
+    """
+    A dict of request.data the view can modify. QueryDict.copy() deep-copies
+    every value, uploaded files included; these fields are all single-valued.
+    """
+    if isinstance(request.data, QueryDict):
+        return request.data.dict()
+    return dict(request.data)
+
+
+def already_queued_response():
+    return Response({
+        'success': False,
+        'message': 'Email is already queued for sending'
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
 class EmailManagerViewSet(viewsets.ModelViewSet):
     
     queryset = EmailManager.objects.all()
@@ -43,8 +81,9 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = EmailManager.objects.filter(is_deleted=False)
+        params = self.request.query_params
         
-        email = self.request.query_params.get('email', None)
+        email = params.get('email')
         if email:
             queryset = queryset.filter(
                 Q(to__icontains=email) |
@@ -52,38 +91,19 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
                 Q(bcc__icontains=email)
             )
         
-        policy_number = self.request.query_params.get('policy_number', None)
-        if policy_number:
-            queryset = queryset.filter(policy_number__icontains=policy_number)
-        
-        customer_name = self.request.query_params.get('customer_name', None)
-        if customer_name:
-            queryset = queryset.filter(customer_name__icontains=customer_name)
-        
-        priority = self.request.query_params.get('priority', None)
-        if priority:
-            queryset = queryset.filter(priority=priority)
-        
-        schedule_send = self.request.query_params.get('schedule_send', None)
-        if schedule_send is not None:
-            schedule_send_bool = schedule_send.lower() == 'true'
-            queryset = queryset.filter(schedule_send=schedule_send_bool)
+        filters = {}
+        for param, lookup in EMAIL_MANAGER_FILTER_PARAMS.items():
+            value = params.get(param)
+            if value:
+                filters[lookup] = value
+        for param in EMAIL_MANAGER_BOOLEAN_PARAMS:
+            value = params.get(param)
+            if value is not None:
+                filters[param] = value.lower() == 'true'
+        if filters:
+            queryset = queryset.filter(**filters)
         
-        email_status = self.request.query_params.get('email_status', None)
-        if email_status:
-            queryset = queryset.filter(email_status=email_status)
-        
-        track_opens = self.request.query_params.get('track_opens', None)
-        if track_opens is not None:
-            track_opens_bool = track_opens.lower() == 'true'
-            queryset = queryset.filter(track_opens=track_opens_bool)
-        
-        track_clicks = self.request.query_params.get('track_clicks', None)
-        if track_clicks is not None:
-            track_clicks_bool = track_clicks.lower() == 'true'
-            queryset = queryset.filter(track_clicks=track_clicks_bool)
-        
-        search = self.request.query_params.get('search', None)
+        search = params.get('search')
         if search:
             queryset = queryset.filter(
                 Q(subject__icontains=search) |
@@ -100,13 +120,12 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
     
     def create(self, request, *args, **kwargs):
-        data = request.data.copy()
+        data = editable_request_data(request)
         template_id = data.get('templates_id')
 
         if template_id:
             try:
-                from apps.templates.models import Template
-                template = Template.objects.get(id=template_id)
+                template = get_template(template_id)
                 data['subject'] = data.get('subject') or template.subject
                 data['message'] = data.get('message') or template.content
 
@@ -123,18 +142,13 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
 
         send_now = request.data.get('send_now', True)
         if send_now and not email_manager.schedule_send:
-            send_result = EmailManagerService.send_email(email_manager)
-            if not send_result['success']:
-                email_manager.refresh_from_db()
-                serializer = self.get_serializer(email_manager)
-                return Response({
-                    'success': True,
-                    'message': 'Email created but sending failed',
-                    'data': serializer.data,
-                    'send_error': send_result.get('error')
-                }, status=status.HTTP_201_CREATED)
-            email_manager.refresh_from_db()
+            queue_email_send(email_manager)
             serializer = self.get_serializer(email_manager)
+            return Response({
+                'success': True,
+                'message': 'Email manager entry created and queued for sending',
+                'data': serializer.data
+            }, status=status.HTTP_202_ACCEPTED)
 
         headers = self.get_success_headers(serializer.data)
         return Response({
@@ -167,236 +181,216 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def get_all_emails(self, request):
-        try:
-            emails = self.get_queryset()
-            serializer = self.get_serializer(emails, many=True)
-            
-            return Response({
-                'success': True,
-                'message': 'Email manager entries retrieved successfully',
-                'data': serializer.data,
-                'count': emails.count()
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Error retrieving email manager entries: {str(e)}',
-                'data': []
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        emails = self.get_queryset().values(*EmailManagerValuesSerializer.Meta.fields)
+        page = self.paginate_queryset(emails)
+        serializer = EmailManagerValuesSerializer(page, many=True)
+        return self._list_response(serializer.data, 'Email manager entries retrieved successfully')
     
     @action(detail=False, methods=['get'])
     def scheduled_emails(self, request):
-        try:
-            scheduled_emails = EmailManager.objects.filter(
-                schedule_send=True,
-                is_deleted=False
-            ).order_by('schedule_date_time')
-            serializer = self.get_serializer(scheduled_emails, many=True)
-            
-            return Response({
-                'success': True,
-                'message': 'Scheduled emails retrieved successfully',
-                'data': serializer.data,
-                'count': scheduled_emails.count()
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Error retrieving scheduled emails: {str(e)}',
-                'data': []
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        scheduled_emails = EmailManager.objects.filter(
+            schedule_send=True,
+            is_deleted=False
+        ).order_by('schedule_date_time', 'id').values(*EmailManagerValuesSerializer.Meta.fields)
+        return self._cached_page(
+            'scheduled_emails', scheduled_emails, EmailManagerValuesSerializer,
+            'Scheduled emails retrieved successfully'
+        )
+
+    def _cached_page(self, name, queryset, serializer_class, message):
+        """
+        Paginate queryset, caching only the page's serialized rows and the
+        total count. The envelope is built per request, because its
+        next/previous links carry the request's scheme and host.
+        """
+        def compute():
+            page = self.paginate_queryset(queryset)
+            return {
+                'count': self.paginator.page.paginator.count,
+                'results': serializer_class(page, many=True).data,
+            }
+
+        data = get_cached_list(name, self.request.query_params, compute)
+        # Paginating a range of the cached count sets up the page for the links without a query
+        self.paginate_queryset(range(data['count']))
+        return self._list_response(data['results'], message)
+
+    def _list_response(self, rows, message):
+        """
+        Wrap a page of rows in the list endpoints' original envelope (success,
+        message, count, data), followed by the pagination fields.
+        """
+        page = self.get_paginated_response(rows).data
+        return Response(OrderedDict([
+            ('success', True),
+            ('message', message),
+            ('count', page['count']),
+            ('data', page['results']),
+            ('total_pages', page['total_pages']),
+            ('current_page', page['current_page']),
+            ('page_size', page['page_size']),
+            ('next', page['next']),
+            ('previous', page['previous']),
+        ]), status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'])
     def priorities(self, request):
-        try:
-            priorities = [
-                {'value': choice[0], 'label': choice[1]} 
-                for choice in EmailManager.PRIORITY_CHOICES
-            ]
+        return Response({
+            'success': True,
+            'message': 'Priority options retrieved successfully',
+            'data': PRIORITY_OPTIONS
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['post'])
+    def send(self, request, pk=None):
+        email_manager = self.get_object()
+
+        if email_manager.email_status == 'sent':
             return Response({
-                'success': True,
-                'message': 'Priority options retrieved successfully',
-                'data': priorities
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
+                'success': False,
+                'message': 'Email has already been sent',
+                'sent_at': email_manager.sent_at.isoformat() if email_manager.sent_at else None
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if send_in_flight(email_manager):
+            return already_queued_response()
+
+        if email_manager.schedule_send and email_manager.is_scheduled_for_future():
             return Response({
                 'success': False,
-                'message': f'Error retrieving priority options: {str(e)}',
-                'data': []
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'message': 'Not time yet'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not queue_email_send(email_manager):
+            return already_queued_response()
+        serializer = self.get_serializer(email_manager)
+        return Response({
+            'success': True,
+            'message': 'Email queued for sending',
+            'data': serializer.data
+        }, status=status.HTTP_202_ACCEPTED)
     
-    @action(detail=True, methods=['post'])
-    def send(self, request, pk=None):
-        try:
-            email_manager = self.get_object()
-            
+    @action(detail=False, methods=['post'])
+    def send_email(self, request):
+        email_id = request.data.get('id') or request.query_params.get('id')
+
+        if email_id:
+            try:
+                email_manager = EmailManager.objects.get(id=email_id, is_deleted=False)
+            except EmailManager.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'message': f'Email with ID {email_id} not found',
+                    'error': 'Email does not exist'
+                }, status=status.HTTP_404_NOT_FOUND)
+
             if email_manager.email_status == 'sent':
                 return Response({
                     'success': False,
                     'message': 'Email has already been sent',
                     'sent_at': email_manager.sent_at.isoformat() if email_manager.sent_at else None
                 }, status=status.HTTP_400_BAD_REQUEST)
-            
-            result = EmailManagerService.send_email(email_manager)
-            
-            if result['success']:
-                email_manager.refresh_from_db()
-                serializer = self.get_serializer(email_manager)
-                return Response({
-                    'success': True,
-                    'message': result['message'],
-                    'data': serializer.data
-                }, status=status.HTTP_200_OK)
-            else:
+
+            if send_in_flight(email_manager):
+                return already_queued_response()
+        else:
+            if not request.data.get('to'):
                 return Response({
                     'success': False,
-                    'message': result['message'],
-                    'error': result.get('error')
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                
-        except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Error sending email: {str(e)}',
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    @action(detail=False, methods=['post'])
-    def send_email(self, request):
-        try:
-            email_id = request.data.get('id') or request.query_params.get('id')
-            
-            if email_id:
+                    'message': 'Required fields missing',
+                    'error': 'Please provide "to" field to send a new email, or provide "id" to send an existing email'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            email_data = editable_request_data(request)
+            if 'templates_id' in email_data:
+                email_data['template'] = email_data.pop('templates_id')
+
+            template = None
+            if email_data.get('template'):
                 try:
-                    email_manager = EmailManager.objects.get(id=email_id, is_deleted=False)
-                except EmailManager.DoesNotExist:
+                    template = get_template(email_data['template'])
+                    if not template.is_active:
+                        raise Template.DoesNotExist
+                except (Template.DoesNotExist, ValueError, TypeError):
                     return Response({
                         'success': False,
-                        'message': f'Email with ID {email_id} not found',
-                        'error': 'Email does not exist'
+                        'message': 'Template not found',
+                        'error': f"Template with ID {email_data.get('template')} does not exist or is not active"
                     }, status=status.HTTP_404_NOT_FOUND)
-                
-                if email_manager.email_status == 'sent':
-                    return Response({
-                        'success': False,
-                        'message': 'Email has already been sent',
-                        'sent_at': email_manager.sent_at.isoformat() if email_manager.sent_at else None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                if not request.data.get('to'):
-                    return Response({
-                        'success': False,
-                        'message': 'Required fields missing',
-                        'error': 'Please provide "to" field to send a new email, or provide "id" to send an existing email'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                email_data = request.data.copy()
-                if 'templates_id' in email_data:
-                    email_data['template'] = email_data.pop('templates_id')
-
-                policy_number = email_data.get('policy_number')
-                context = {}
-
-                if policy_number:
-                    try:
-                        policy = Policy.objects.get(policy_number=policy_number)
-                        customer = policy.customer
-                        context = {
-                            'first_name': customer.first_name,
-                            'last_name': customer.last_name,
-                            'full_name': customer.full_name,
-                            'policy_number': policy.policy_number,
-                            'expiry_date': policy.end_date.strftime('%Y-%m-%d') if policy.end_date else '',
-                            'premium_amount': policy.premium_amount,
-                        }
-                    except Policy.DoesNotExist:
-                        pass
-
-                template = None
-                if email_data.get('template'):
-                    try:
-                        template = Template.objects.get(id=email_data['template'], is_active=True)
-                    except (Template.DoesNotExist, ValueError, TypeError):
-                        return Response({
-                            'success': False,
-                            'message': 'Template not found',
-                            'error': f"Template with ID {email_data.get('template')} does not exist or is not active"
-                        }, status=status.HTTP_404_NOT_FOUND)
-
-                if template:
-                    if not email_data.get('subject') and template.subject:
-                        email_data['subject'] = template.subject
-                    if not email_data.get('message') and template.content:
-                        email_data['message'] = template.content
-                    
-                    if context:
-                        subject_template = DjangoTemplate(email_data['subject'])
-                        message_template = DjangoTemplate(email_data['message'])
-                        
-                        email_data['subject'] = subject_template.render(Context(context))
-                        email_data['message'] = message_template.render(Context(context))
-
-                if not email_data.get('subject'):
-                    return Response({
-                        'success': False,
-                        'message': 'Required fields missing',
-                        'error': 'Please provide "subject" field or a valid "template" with subject'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                if not email_data.get('message'):
-                    return Response({
-                        'success': False,
-                        'message': 'Required fields missing',
-                        'error': 'Please provide "message" field or a valid "template" with content'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                create_serializer = EmailManagerCreateSerializer(data=email_data)
-                if not create_serializer.is_valid():
-                    return Response({
-                        'success': False,
-                        'message': 'Validation error',
-                        'error': create_serializer.errors
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                email_manager = create_serializer.save(created_by=request.user)
-                email_manager.from_email = "renewals@intelipro.in"
-                email_manager.save(update_fields=['from_email'])
-
-                if not email_manager.schedule_send:
-                    email_manager.schedule_send = False
-                    email_manager.save()
-            
-            email_manager.from_email = "renewals@intelipro.in"
-            email_manager.save(update_fields=['from_email'])
-            result = EmailManagerService.send_email(email_manager)
-            
-            if result['success']:
-                email_manager.refresh_from_db()
-                serializer = self.get_serializer(email_manager)
+
+            # The policy only feeds template rendering, so it is looked up
+            # once a valid template is known.
+            policy_number = email_data.get('policy_number')
+            context = {}
+
+            if template and policy_number:
+                try:
+                    policy = Policy.objects.select_related('customer').only(
+                        'policy_number', 'end_date', 'premium_amount', *CUSTOMER_NAME_FIELDS
+                    ).get(policy_number=policy_number)
+                    customer = policy.customer
+                    context = {
+                        'first_name': customer.first_name,
+                        'last_name': customer.last_name,
+                        'full_name': customer.full_name,
+                        'policy_number': policy.policy_number,
+                        'expiry_date': policy.end_date.strftime('%Y-%m-%d') if policy.end_date else '',
+                        'premium_amount': policy.premium_amount,
+                    }
+                except Policy.DoesNotExist:
+                    pass
+
+            if template:
+                if not email_data.get('subject') and template.subject:
+                    email_data['subject'] = template.subject
+                if not email_data.get('message') and template.content:
+                    email_data['message'] = template.content
+
+                if context:
+                    email_data['subject'] = render_template(email_data['subject'], context)
+                    email_data['message'] = render_template(email_data['message'], context)
+
+            if not email_data.get('subject'):
                 return Response({
-                    'success': True,
-                    'message': result['message'],
-                    'data': serializer.data
-                }, status=status.HTTP_200_OK)
-            else:
-                email_manager.refresh_from_db()
-                serializer = self.get_serializer(email_manager)
+                    'success': False,
+                    'message': 'Required fields missing',
+                    'error': 'Please provide "subject" field or a valid "template" with subject'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            if not email_data.get('message'):
                 return Response({
                     'success': False,
-                    'message': result['message'],
-                    'error': result.get('error'),
-                    'data': serializer.data
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                
-        except Exception as e:
+                    'message': 'Required fields missing',
+                    'error': 'Please provide "message" field or a valid "template" with content'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            create_serializer = EmailManagerCreateSerializer(data=email_data)
+            if not create_serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'message': 'Validation error',
+                    'error': create_serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            email_manager = create_serializer.save(created_by=request.user, from_email="renewals@intelipro.in")
+
+        if email_manager.from_email != "renewals@intelipro.in":
+            email_manager.from_email = "renewals@intelipro.in"
+            email_manager.save(update_fields=['from_email'])
+        if email_manager.schedule_send and email_manager.is_scheduled_for_future():
             return Response({
                 'success': False,
-                'message': f'Error sending email: {str(e)}',
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'message': 'Not time yet'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not queue_email_send(email_manager):
+            return already_queued_response()
+        serializer = self.get_serializer(email_manager)
+        return Response({
+            'success': True,
+            'message': 'Email queued for sending',
+            'data': serializer.data
+        }, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=False, methods=['post'], url_path='send_scheduled')
     def send_scheduled(self, request):
@@ -419,84 +413,71 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def sent_emails(self, request):
-        try:
-            sent_emails = EmailManager.objects.filter(
-                email_status='sent',
-                is_deleted=False
-            ).order_by('-sent_at')
-
-            serializer = SentEmailListSerializer(sent_emails, many=True)
-
-            return Response({
-                'success': True,
-                'message': 'Sent emails retrieved successfully',
-                'count': sent_emails.count(),
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
-        
-        except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Error retrieving sent emails: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        sent_emails = EmailManager.objects.filter(
+            email_status='sent',
+            is_deleted=False
+        ).only(
+            'id', 'to', 'subject', 'policy_number', 'priority',
+            'email_status', 'sent_at', 'message'
+        ).order_by('-sent_at', 'id')
+        sent_emails = SentEmailListSerializer.annotate_due_date(sent_emails)
+        return self._cached_page(
+            'sent_emails', sent_emails, SentEmailListSerializer,
+            'Sent emails retrieved successfully'
+        )
         
     @action(detail=False, methods=['get'], url_path='email_details/(?P<pk>[^/.]+)')
     def email_details(self, request, pk=None):
         try:
             email = EmailManager.objects.get(id=pk, is_deleted=False)
-            serializer = EmailManagerSerializer(email)
-
-            renewal_info = {}
-            if email.policy_number:
-                try:
-                    policy = Policy.objects.get(policy_number=email.policy_number)
-                    renewal_info = {
-                        "policy_number": policy.policy_number,
-                        "customer_name": policy.customer.full_name,
-                        "renewal_date": policy.renewal_date.strftime("%Y-%m-%d") if policy.renewal_date else None,
-                        "premium_amount": str(policy.premium_amount),
-                    }
-                except Policy.DoesNotExist:
-                    renewal_info = {
-                        "policy_number": email.policy_number,
-                        "customer_name": email.customer_name,
-                        "renewal_date": email.renewal_date,
-                        "premium_amount": str(email.premium_amount) if email.premium_amount else None,
-                    }
-
-            tracking_info = {
-                "opens": 0,
-                "clicks": 0,
-            }
-
-            response_data = {
-                "success": True,
-                "message": "Email details retrieved successfully",
-                "data": {
-                    "email_info": {
-                        **serializer.data,              
-                        "from_email": email.from_email,   
-                    },
-                    "renewal_information": renewal_info,
-                    "email_tracking": tracking_info,
-                },
-            }
-
-            return Response(response_data, status=status.HTTP_200_OK)
-
         except EmailManager.DoesNotExist:
             return Response({
                 "success": False,
                 "message": f"Email with ID {pk} not found"
             }, status=status.HTTP_404_NOT_FOUND)
 
-        except Exception as e:
-            return Response({
-                "success": False,
-                "message": f"Error retrieving email details: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        serializer = EmailManagerSerializer(email)
+
+        renewal_info = {}
+        if email.policy_number:
+            try:
+                policy = Policy.objects.select_related('customer').only(
+                    'policy_number', 'renewal_date', 'premium_amount', *CUSTOMER_NAME_FIELDS
+                ).get(policy_number=email.policy_number)
+                renewal_info = {
+                    "policy_number": policy.policy_number,
+                    "customer_name": policy.customer.full_name,
+                    "renewal_date": policy.renewal_date.strftime("%Y-%m-%d") if policy.renewal_date else None,
+                    "premium_amount": str(policy.premium_amount),
+                }
+            except Policy.DoesNotExist:
+                renewal_info = {
+                    "policy_number": email.policy_number,
+                    "customer_name": email.customer_name,
+                    "renewal_date": email.renewal_date,
+                    "premium_amount": str(email.premium_amount) if email.premium_amount else None,
+                }
+
+        tracking_info = {
+            "opens": 0,
+            "clicks": 0,
+        }
 
+        response_data = {
+            "success": True,
+            "message": "Email details retrieved successfully",
+            "data": {
+                "email_info": {
+                    **serializer.data,              
+                    "from_email": email.from_email,   
+                },
+                "renewal_information": renewal_info,
+                "email_tracking": tracking_info,
+            },
+        }
 
+        return Response(response_data, status=status.HTTP_200_OK)
+    
     @action(detail=False, methods=['get'])
     def started_emails(self, request):
         try:
@@ -614,7 +595,9 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
                 subject = f"Re: {original_email.subject}"
                 in_reply_to = original_email.message_id
             except EmailManager.DoesNotExist:
-                inbox_email = EmailManagerInbox.objects.get(id=pk, started=True, is_deleted=False)
+                inbox_email = EmailManagerInbox.objects.select_related('related_email').get(
+                    id=pk, started=True, is_deleted=False
+                )
                 to_email = inbox_email.from_email
                 subject = f"Re: {inbox_email.subject}"
                 in_reply_to = inbox_email.message_id
@@ -641,14 +624,12 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
 
             if template_id:
                 try:
-                    template = Template.objects.get(id=template_id)
+                    template = get_template(template_id)
 
                     if template.subject:
-                        subject_template = DjangoTemplate(template.subject)
-                        subject = subject_template.render(Context(context_data))
+                        subject = render_template(template.subject, context_data)
 
-                    content_template = DjangoTemplate(template.content)
-                    rendered_message = content_template.render(Context(context_data))
+                    rendered_message = render_template(template.content, context_data)
 
                     message = strip_tags(rendered_message)
                     html_message = rendered_message
@@ -736,7 +717,7 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
 
             if template_id:
                 try:
-                    tpl = Template.objects.get(id=template_id)
+                    tpl = get_template(template_id)
 
                     context_data = {
                         "first_name": original_email.customer_name or "",
@@ -745,7 +726,7 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
                         "premium_amount": original_email.premium_amount or "",
                     }
 
-                    html_body = DjangoTemplate(tpl.content).render(Context(context_data))
+                    html_body = render_template(tpl.content, context_data)
                     text_body = strip_tags(html_body)
 
                 except Template.DoesNotExist:
@@ -831,7 +812,7 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
 
             if template_id:
                 try:
-                    tpl = Template.objects.get(id=template_id)
+                    tpl = get_template(template_id)
 
                     context_data = {
                         "first_name": original_email.customer_name or "",
@@ -840,7 +821,7 @@ class EmailManagerViewSet(viewsets.ModelViewSet):
                         "premium_amount": original_email.premium_amount or "",
                     }
 
-                    html_body = DjangoTemplate(tpl.content).render(Context(context_data))
+                    html_body = render_template(tpl.content, context_data)
                     text_body = strip_tags(html_body)
 
                 except Template.DoesNotExist:
@@ -918,6 +899,10 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
         if is_read is not None:
             queryset = queryset.filter(is_read=is_read.lower() == "true")
 
+        # These actions read fields of the original sent email
+        if self.action in ('email_details', 'reply_email', 'forward_email'):
+            queryset = queryset.select_related('related_email')
+
         return queryset
 
     @action(detail=False, methods=['get'], url_path='reply-emails')
@@ -930,7 +915,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
             return Response({
                 'success': True,
                 'message': 'Reply emails retrieved successfully',
-                'count': reply_emails.count(),
+                'count': len(serializer.data),
                 'data': serializer.data
             }, status=status.HTTP_200_OK)
         
@@ -977,7 +962,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
             return Response({
                 'success': True,
                 'message': 'Reply emails fetched successfully',
-                'count': queryset.count(),
+                'count': len(serializer.data),
                 'data': serializer.data
             }, status=status.HTTP_200_OK)
 
@@ -993,7 +978,13 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
             email = self.get_object()
             serializer = self.get_serializer(email)
 
-            ai_analysis = analyze_email_sentiment_and_intent(email.message or email.html_message or "")
+            # AI analysis runs on the Celery ai_queue; until it lands, report the neutral default
+            if email.sentiment is None:
+                queue_inbox_analysis(email.id)
+            ai_analysis = {
+                "sentiment": email.sentiment or DEFAULT_ANALYSIS["sentiment"],
+                "intent": email.intent or DEFAULT_ANALYSIS["intent"],
+            }
 
             related_info = {}
             if email.related_email:
@@ -1074,32 +1065,20 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
                 .order_by("-count")[:5]
             )
 
-            positive = neutral = negative = 0
-
             inbox_emails = EmailManagerInbox.objects.filter(is_deleted=False)
 
-            for email_obj in inbox_emails:
-
-                raw_text = email_obj.html_message or email_obj.message or ""
-                raw_text = raw_text.strip()
+            # Sentiment is stored by the AI tasks; batch-analyze any not yet analyzed
+            if inbox_emails.filter(sentiment__isnull=True).exists():
+                queue_pending_analysis()
 
-                if not raw_text or len(raw_text) < 5:
-                    continue
-
-                import re
-                raw_text = re.sub(r"<(script|style).*?>.*?</\\1>", "", raw_text, flags=re.S)
-
-                print("AI INPUT (FIRST 300 CHARS):", raw_text[:300])
-
-                result = analyze_email_sentiment_and_intent(raw_text)
-                sentiment_full = result.get("sentiment", "").lower()
-
-                if "positive" in sentiment_full:
-                    positive += 1
-                elif "negative" in sentiment_full:
-                    negative += 1
-                else:
-                    neutral += 1
+            sentiment_counts = inbox_emails.aggregate(
+                positive=Count('id', filter=Q(sentiment__istartswith='positive')),
+                negative=Count('id', filter=Q(sentiment__istartswith='negative')),
+                neutral=Count('id', filter=Q(sentiment__isnull=False) & ~Q(sentiment__istartswith='positive') & ~Q(sentiment__istartswith='negative')),
+            )
+            positive = sentiment_counts['positive']
+            neutral = sentiment_counts['neutral']
+            negative = sentiment_counts['negative']
 
             total_sentiment = positive + neutral + negative
 
@@ -1169,7 +1148,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
 
             if template_id:
                 try:
-                    template = Template.objects.get(id=template_id)
+                    template = get_template(template_id)
 
                     context_data = {
                         "first_name": inbox.related_email.customer_name if inbox.related_email else "",
@@ -1179,7 +1158,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
                         "agent_name": "Agent"
                     }
 
-                    message = DjangoTemplate(template.content).render(Context(context_data))
+                    message = render_template(template.content, context_data)
                     html_message = message  
 
                 except Template.DoesNotExist:
@@ -1278,7 +1257,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
 
             if template_id:
                 try:
-                    tpl = Template.objects.get(id=template_id)
+                    tpl = get_template(template_id)
 
                     context_data = {}
                     if inbox_email.related_email:
@@ -1291,7 +1270,7 @@ class EmailManagerInboxViewSet(viewsets.ModelViewSet):
                         }
 
                     # Render template
-                    html_body = DjangoTemplate(tpl.content).render(Context(context_data))
+                    html_body = render_template(tpl.content, context_data)
                     text_body = strip_tags(html_body)
 
                 except Template.DoesNotExist:
@@ -1,13 +1,29 @@
+from django.db.models import Case, DecimalField, F, Value, When
+from django.db.models.functions import Cast
 from rest_framework import serializers
 from .models import EmailProviderConfig, EmailProviderHealthLog, EmailProviderUsageLog, EmailProviderTestResult
 
 
+class ChoiceLabelField(serializers.ReadOnlyField):
+    """
+    Label of a choices field from a dict built once, in place of
+    get_FOO_display(), which rebuilds the choices dict on every call.
+    """
+    
+    def __init__(self, model, field_name, **kwargs):
+        self.labels = dict(model._meta.get_field(field_name).flatchoices)
+        super().__init__(source=field_name, **kwargs)
+    
+    def to_representation(self, value):
+        return str(self.labels.get(value, value))
+
+
 class EmailProviderConfigSerializer(serializers.ModelSerializer):
     """Serializer for EmailProviderConfig"""
     
-    provider_type_display = serializers.CharField(source='get_provider_type_display', read_only=True)
-    priority_display = serializers.CharField(source='get_priority_display', read_only=True)
-    health_status_display = serializers.CharField(source='get_health_status_display', read_only=True)
+    provider_type_display = ChoiceLabelField(EmailProviderConfig, 'provider_type')
+    priority_display = ChoiceLabelField(EmailProviderConfig, 'priority')
+    health_status_display = ChoiceLabelField(EmailProviderConfig, 'health_status')
     
     class Meta:
         model = EmailProviderConfig
@@ -42,6 +58,24 @@ class EmailProviderConfigSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class EmailProviderConfigListSerializer(serializers.ModelSerializer):
+    """Lean serializer for listing EmailProviderConfig; leaves out credentials and SMTP settings"""
+    
+    provider_type_display = ChoiceLabelField(EmailProviderConfig, 'provider_type')
+    priority_display = ChoiceLabelField(EmailProviderConfig, 'priority')
+    health_status_display = ChoiceLabelField(EmailProviderConfig, 'health_status')
+    
+    class Meta:
+        model = EmailProviderConfig
+        fields = [
+            'id', 'name', 'provider_type', 'provider_type_display', 'from_email',
+            'priority', 'priority_display', 'is_default', 'is_active',
+            'last_health_check', 'health_status', 'health_status_display',
+            'daily_limit', 'emails_sent_today'
+        ]
+        read_only_fields = fields
+
+
 class EmailProviderConfigCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating EmailProviderConfig (includes all fields)"""
     
@@ -169,11 +203,11 @@ class EmailProviderHealthLogSerializer(serializers.ModelSerializer):
 
 
 class EmailProviderUsageLogSerializer(serializers.ModelSerializer):
-    """Serializer for EmailProviderUsageLog"""
+    """Serializer for EmailProviderUsageLog; expects a queryset from annotate_rates()"""
     
     provider_name = serializers.CharField(source='provider.name', read_only=True)
-    success_rate = serializers.SerializerMethodField()
-    average_response_time = serializers.SerializerMethodField()
+    success_rate = serializers.FloatField(read_only=True)
+    average_response_time = serializers.FloatField(read_only=True)
     
     class Meta:
         model = EmailProviderUsageLog
@@ -184,24 +218,34 @@ class EmailProviderUsageLogSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'logged_at']
     
-    def get_success_rate(self, obj):
-        """Calculate success rate percentage"""
-        if obj.emails_sent == 0:
-            return 0
-        return round((obj.success_count / obj.emails_sent) * 100, 2)
-    
-    def get_average_response_time(self, obj):
-        """Calculate average response time"""
-        if obj.success_count == 0:
-            return 0
-        return round(obj.total_response_time / obj.success_count, 3)
+    @staticmethod
+    def annotate_rates(queryset):
+        """Compute success rate (%) and average response time in SQL, rounded as before"""
+        return queryset.annotate(
+            success_rate=Case(
+                When(emails_sent=0, then=Value(0)),
+                default=Cast(
+                    F('success_count') * 100.0 / F('emails_sent'),
+                    DecimalField(max_digits=7, decimal_places=2)
+                ),
+                output_field=DecimalField(max_digits=7, decimal_places=2)
+            ),
+            average_response_time=Case(
+                When(success_count=0, then=Value(0)),
+                default=Cast(
+                    F('total_response_time') / F('success_count'),
+                    DecimalField(max_digits=15, decimal_places=3)
+                ),
+                output_field=DecimalField(max_digits=15, decimal_places=3)
+            ),
+        )
 
 
 class EmailProviderTestResultSerializer(serializers.ModelSerializer):
     """Serializer for EmailProviderTestResult"""
     
     provider_name = serializers.CharField(source='provider.name', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    status_display = ChoiceLabelField(EmailProviderTestResult, 'status')
     tested_by_name = serializers.CharField(source='tested_by.get_full_name', read_only=True)
     
     class Meta:
@@ -9,7 +9,7 @@ from datetime import timedelta
 
 from .models import EmailProviderConfig, EmailProviderHealthLog, EmailProviderUsageLog, EmailProviderTestResult
 from .serializers import (
-    EmailProviderConfigSerializer, EmailProviderConfigCreateSerializer,
+    EmailProviderConfigSerializer, EmailProviderConfigListSerializer, EmailProviderConfigCreateSerializer,
     EmailProviderConfigUpdateSerializer, EmailProviderCredentialsSerializer,
     EmailProviderHealthLogSerializer, EmailProviderUsageLogSerializer,
     EmailProviderTestResultSerializer, EmailProviderTestSerializer,
@@ -18,6 +18,12 @@ from .serializers import (
 from .services import EmailProviderService
 from apps.billing.models import CommunicationLog
 
+# Columns EmailProviderConfigListSerializer reads
+PROVIDER_LIST_COLUMNS = (
+    'id', 'name', 'provider_type', 'from_email', 'priority', 'is_default', 'is_active',
+    'last_health_check', 'health_status', 'daily_limit', 'emails_sent_today'
+)
+
 
 class EmailProviderConfigViewSet(viewsets.ModelViewSet):
     """ViewSet for managing email provider configurations"""
@@ -32,12 +38,17 @@ class EmailProviderConfigViewSet(viewsets.ModelViewSet):
             return EmailProviderConfigUpdateSerializer
         elif self.action == 'update_credentials':
             return EmailProviderCredentialsSerializer
+        elif self.action == 'list':
+            return EmailProviderConfigListSerializer
         return EmailProviderConfigSerializer
     
     def get_queryset(self):
         """Filter providers based on query parameters"""
         queryset = super().get_queryset()
         
+        if self.action == 'list':
+            queryset = queryset.only(*PROVIDER_LIST_COLUMNS)
+        
         # Ensure soft-deleted providers are excluded
         queryset = queryset.filter(is_deleted=False)
         
@@ -308,6 +319,7 @@ class EmailProviderUsageLogViewSet(viewsets.ReadOnlyModelViewSet):
         if end_date:
             queryset = queryset.filter(logged_at__lte=end_date)
         
+        queryset = EmailProviderUsageLogSerializer.annotate_rates(queryset.select_related('provider'))
         return queryset.order_by('-logged_at')
 
 
@@ -1,15 +1,30 @@
 import imaplib
 import email
+import logging
 from unittest import result
-import requests
 import email.utils
 from email.header import decode_header
 from django.utils import timezone
 from dateutil import parser
+from django.conf import settings
+from django.db import transaction
 from .models import EmailAccount, ClassificationRule, EmailModuleSettings
 from .utils import EmailTransport, normalize_and_get_credential
+from .tasks import deliver_webhook
+from apps.core.imap import imap_pool
+from apps.email_inbox.models import EmailInboxMessage
 from apps.email_inbox.services import EmailInboxService
 
+logger = logging.getLogger(__name__)
+
+# Messages fetched per IMAP round trip; kept bounded so servers do not reject
+# the request line as too long.
+FETCH_BATCH_SIZE = getattr(settings, 'EMAIL_SYNC_FETCH_BATCH_SIZE', 50)
+
+# Upper bound on the stored text and html bodies; anything past it is dropped.
+MAX_BODY_BYTES = getattr(settings, 'EMAIL_SYNC_MAX_BODY_BYTES', 1 << 20)
+
+
 class EmailSyncService:
     def sync_account(self, account_id):
         """
@@ -31,31 +46,46 @@ class EmailSyncService:
                 credential=credential,
                 use_ssl_tls=account.use_ssl_tls
             )
-            # 1. Connect to IMAP
-            # 1. Connect to IMAP
-            mail = imaplib.IMAP4_SSL(transport.imap_server, transport.imap_port, timeout=transport.timeout)
-            mail.login(account.email_address, credential)
-            mail.select("INBOX")
-
-            # 2. Search for UNREAD messages
-            # (Fetching only unread keeps it fast. Remove 'UNSEEN' to fetch all if needed)
-            status, messages = mail.search(None, 'UNSEEN')
-            email_ids = messages[0].split()
-
-            synced_count = 0
-            
-            for e_id in email_ids:
-                # Fetch the email body (RFC822)
-                _, msg_data = mail.fetch(e_id, "(RFC822)")
-                
-                for response_part in msg_data:
-                    if isinstance(response_part, tuple):
-                        msg = email.message_from_bytes(response_part[1])
-                        self._process_and_save_email(account, msg)
-                        synced_count += 1
-            
-            mail.logout()
-            
+            # 1. Connect to IMAP (reusing a pooled connection when one is alive)
+            with imap_pool.connection(
+                transport.imap_server, transport.imap_port, account.email_address,
+                credential, timeout=transport.timeout, mailbox="INBOX"
+            ) as mail:
+                # 2. Search for UNREAD messages
+                # (Fetching only unread keeps it fast. Remove 'UNSEEN' to fetch all if needed)
+                status, messages = mail.uid('SEARCH', None, 'UNSEEN')
+                email_uids = messages[0].split()
+
+                synced_count = 0
+
+                # 3. Fetch the bodies (RFC822) in batches, one round trip and one
+                # transaction per batch. RFC822 marks the messages \Seen, so each
+                # message gets its own savepoint: a failed insert only rolls back
+                # that message instead of the whole batch.
+                for start in range(0, len(email_uids), FETCH_BATCH_SIZE):
+                    batch = email_uids[start:start + FETCH_BATCH_SIZE]
+                    _, msg_data = mail.uid('FETCH', b','.join(batch), "(RFC822)")
+
+                    msgs = [
+                        email.message_from_bytes(response_part[1])
+                        for response_part in msg_data
+                        if isinstance(response_part, tuple)
+                    ]
+                    message_ids = [self._message_id(msg) for msg in msgs]
+                    existing_ids = set(
+                        EmailInboxMessage.objects.filter(
+                            message_id__in=[m for m in message_ids if m]
+                        ).values_list('message_id', flat=True)
+                    )
+
+                    with transaction.atomic():
+                        for msg, message_id in zip(msgs, message_ids):
+                            if message_id and message_id in existing_ids:
+                                continue
+                            with transaction.atomic():
+                                if self._process_and_save_email(account, msg, message_id):
+                                    synced_count += 1
+
             # Update account status
             account.last_sync_at = timezone.now()
             account.last_sync_log = f"Successfully synced {synced_count} messages."
@@ -70,34 +100,53 @@ class EmailSyncService:
             account.save()
             return {"success": False, "error": str(e)}
 
-    def _process_and_save_email(self, account, msg):
+    @staticmethod
+    def _message_id(msg):
+        """The Message-ID header, trimmed to fit EmailInboxMessage.message_id."""
+        message_id = (msg.get("Message-ID") or "").strip()
+        return message_id[:255] or None
+
+    def _process_and_save_email(self, account, msg, message_id=None):
         """
-        Parses raw email bytes and saves to DB.
+        Parses raw email bytes and saves to DB. Returns True if a new message was stored.
         """
         # 1. Extract Headers
         subject = self._decode_str(msg["Subject"])
         sender = self._decode_str(msg.get("From"))
         from_name, from_email = email.utils.parseaddr(sender)
 
-        # 2. Extract Body
+        # 2. Extract Body (raw bytes are collected per type and decoded once)
         body_text = ""
         body_html = ""
         if msg.is_multipart():
+            text_buf = bytearray()
+            html_buf = bytearray()
             for part in msg.walk():
+                if len(text_buf) >= MAX_BODY_BYTES and len(html_buf) >= MAX_BODY_BYTES:
+                    break
                 content_type = part.get_content_type()
+                if content_type == "text/plain":
+                    buf = text_buf
+                elif content_type == "text/html":
+                    buf = html_buf
+                else:
+                    continue  # images, attachments etc. are never decoded
                 content_disposition = str(part.get("Content-Disposition"))
+                if "attachment" in content_disposition or len(buf) >= MAX_BODY_BYTES:
+                    continue
                 try:
                     payload = part.get_payload(decode=True)
-                    if payload and "attachment" not in content_disposition:
-                        if content_type == "text/plain":
-                            body_text += payload.decode(errors="ignore")
-                        elif content_type == "text/html":
-                            body_html += payload.decode(errors="ignore")
+                    if payload:
+                        buf.extend(payload[:MAX_BODY_BYTES - len(buf)])
                 except:
                     pass
+            if text_buf:
+                body_text = text_buf.decode(errors="ignore")
+            if html_buf:
+                body_html = html_buf.decode(errors="ignore")
         else:
             try:
-                payload = msg.get_payload(decode=True)
+                payload = msg.get_payload(decode=True)[:MAX_BODY_BYTES]
                 if msg.get_content_type() == "text/html":
                     body_html = payload.decode(errors="ignore")
                 else:
@@ -113,22 +162,29 @@ class EmailSyncService:
             subject=subject,
             html_content=body_html,
             text_content=body_text,
-            source='manual_sync'
+            source='manual_sync',
+            message_id=message_id
         )
-        if result and not result.get('skipped'):
-            from apps.email_inbox.models import EmailInboxMessage
-            email_obj = EmailInboxMessage.objects.filter(message_id=result.get('message_id')).first()
-            
-            if email_obj:
-                self._send_webhook_notification(email_obj, account.user)
+        if not result or not result.get('success') or result.get('skipped'):
+            return False
 
-    def _send_webhook_notification(self, email_obj, user):
+        email_obj = EmailInboxMessage.objects.only(
+            'id', 'message_id', 'subject', 'from_email', 'received_at',
+            'category', 'priority', 'text_content', 'html_content'
+        ).filter(id=result['email_id']).first()
+
+        if email_obj:
+            self._send_webhook_notification(email_obj, account)
+        return True
+
+    def _send_webhook_notification(self, email_obj, account):
         """
-        Checks settings and sends a POST request to the external URL if enabled.
+        Checks settings and queues a POST to the external URL if enabled.
+        Delivery runs on the webhook queue so a slow receiver never holds up the sync.
         """
         try:
             # 1. Load Settings
-            settings = EmailModuleSettings.objects.filter(user=user).first()
+            settings = EmailModuleSettings.objects.filter(user_id=account.user_id).first()
             
             # 2. Check if enabled
             if not settings or not settings.enable_webhook_notifications or not settings.webhook_url:
@@ -137,31 +193,26 @@ class EmailSyncService:
             # 3. Prepare Payload
             payload = {
                 "event": "new_email_received",
-                "account_name": email_obj.email_account.account_name,
+                "account_name": account.account_name,
                 "email_id": email_obj.id,
                 "remote_message_id": email_obj.message_id,
                 "subject": email_obj.subject,
-                "sender": email_obj.sender,
+                "sender": email_obj.from_email,
                 "received_at": email_obj.received_at.isoformat(),
                 "classification": {
                     "category": email_obj.category,
                     "priority": email_obj.priority
                 },
-                "snippet": email_obj.body_text[:200] # Send a preview
+                "snippet": (email_obj.text_content or email_obj.html_content or "")[:200] # Send a preview
             }
 
-            # 4. Fire the Webhook (Timeout is important so we don't hang the sync)
-            print(f"🚀 Triggering Webhook to: {settings.webhook_url}")
-            response = requests.post(settings.webhook_url, json=payload, timeout=5)
-            
-            if response.status_code == 200:
-                print("✅ Webhook delivered successfully.")
-            else:
-                print(f"⚠️ Webhook failed with status: {response.status_code}")
+            # 4. Queue the Webhook once the synced batch is committed
+            webhook_url = settings.webhook_url
+            transaction.on_commit(lambda: deliver_webhook.delay(payload, webhook_url))
 
         except Exception as e:
             # Log error but DO NOT crash the sync process
-            print(f"❌ Webhook Error: {str(e)}")
+            logger.error("Webhook enqueue failed for email %s: %s", email_obj.id, e)
 
     def _decode_str(self, header_val):
         """Helper to decode MIME headers (e.g., =?utf-8?Q?...)"""
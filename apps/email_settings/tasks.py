@@ -0,0 +1,17 @@
+import logging
+
+import requests
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_QUEUE = 'webhook_queue'
+WEBHOOK_TIMEOUT = 5
+
+
+@shared_task(autoretry_for=(requests.RequestException,), retry_backoff=True, max_retries=5, queue=WEBHOOK_QUEUE)
+def deliver_webhook(payload, url):
+    """POST a new-email notification to a user's webhook URL; failures are retried with backoff."""
+    response = requests.post(url, json=payload, timeout=WEBHOOK_TIMEOUT)
+    response.raise_for_status()
+    logger.info("Webhook delivered to %s", url)
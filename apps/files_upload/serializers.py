@@ -1,7 +1,21 @@
+from django.db.models import Case, DecimalField, DurationField, ExpressionWrapper, F, FloatField, Value, When
+from django.db.models.functions import Cast, Extract
 from rest_framework import serializers
 from .models import FileUpload
 import os
 
+
+def format_file_size(size):
+    """Format file size in human readable format"""
+    if not size:
+        return "0 B"
+
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
 class FileUploadSerializer(serializers.ModelSerializer):
     file = serializers.FileField(write_only=True)
     class Meta:
@@ -50,12 +64,61 @@ class FileUploadSerializer(serializers.ModelSerializer):
         )
 
         return file_instance
-class FileUploadListSerializer(serializers.ModelSerializer):
-    """Serializer for listing file upload details"""
+class FileUploadMetricsSerializer(serializers.ModelSerializer):
+    """
+    Base for the list and detail serializers. processing_duration and
+    success_rate are read from annotate_metrics() annotations, and the user
+    FKs in eager_related are expected to be joined, so querysets must go
+    through setup_eager_loading() first.
+    """
 
     file_size_formatted = serializers.SerializerMethodField()
-    processing_duration = serializers.SerializerMethodField()
-    success_rate = serializers.SerializerMethodField()
+    processing_duration = serializers.FloatField(read_only=True)
+    success_rate = serializers.FloatField(read_only=True)
+
+    eager_related = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the users this serializer reads and add the metric annotations"""
+        if cls.eager_related:
+            queryset = queryset.select_related(*cls.eager_related)
+        return cls.annotate_metrics(queryset)
+
+    @staticmethod
+    def annotate_metrics(queryset):
+        """Compute processing duration (seconds) and success rate (%) in SQL, rounded as before"""
+        return queryset.annotate(
+            processing_duration=Extract(
+                ExpressionWrapper(
+                    F('processing_completed_at') - F('processing_started_at'),
+                    output_field=DurationField()
+                ),
+                'epoch',
+                output_field=FloatField()
+            ),
+            success_rate=Case(
+                When(
+                    total_records__gt=0,
+                    then=Cast(
+                        F('successful_records') * 100.0 / F('total_records'),
+                        DecimalField(max_digits=7, decimal_places=2)
+                    )
+                ),
+                default=Value(0),
+                output_field=DecimalField(max_digits=7, decimal_places=2)
+            ),
+        )
+
+    def get_file_size_formatted(self, obj):
+        return format_file_size(obj.file_size)
+
+
+class FileUploadListSerializer(FileUploadMetricsSerializer):
+    """Serializer for listing file upload details"""
+
+    eager_related = ('uploaded_by',)
+
     uploaded_by_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -80,31 +143,6 @@ class FileUploadListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_file_size_formatted(self, obj):
-        """Format file size in human readable format"""
-        if not obj.file_size:
-            return "0 B"
-
-        size = obj.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
-
-    def get_processing_duration(self, obj):
-        """Calculate processing duration in seconds"""
-        if obj.processing_started_at and obj.processing_completed_at:
-            duration = obj.processing_completed_at - obj.processing_started_at
-            return duration.total_seconds()
-        return None
-
-    def get_success_rate(self, obj):
-        """Calculate success rate percentage"""
-        if obj.total_records and obj.total_records > 0:
-            return round((obj.successful_records / obj.total_records) * 100, 2)
-        return 0.0
-
     def get_uploaded_by_name(self, obj):
         """Get the name of the user who uploaded the file"""
         if obj.uploaded_by:
@@ -112,12 +150,11 @@ class FileUploadListSerializer(serializers.ModelSerializer):
         return "Unknown"
 
 
-class FileUploadDetailSerializer(serializers.ModelSerializer):
+class FileUploadDetailSerializer(FileUploadMetricsSerializer):
     """Detailed serializer for individual file upload"""
 
-    file_size_formatted = serializers.SerializerMethodField()
-    processing_duration = serializers.SerializerMethodField()
-    success_rate = serializers.SerializerMethodField()
+    eager_related = ('uploaded_by', 'created_by', 'updated_by')
+
     uploaded_by_details = serializers.SerializerMethodField()
     created_by_details = serializers.SerializerMethodField()
     updated_by_details = serializers.SerializerMethodField()
@@ -152,31 +189,6 @@ class FileUploadDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_file_size_formatted(self, obj):
-        """Format file size in human readable format"""
-        if not obj.file_size:
-            return "0 B"
-
-        size = obj.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
-
-    def get_processing_duration(self, obj):
-        """Calculate processing duration in seconds"""
-        if obj.processing_started_at and obj.processing_completed_at:
-            duration = obj.processing_completed_at - obj.processing_started_at
-            return duration.total_seconds()
-        return None
-
-    def get_success_rate(self, obj):
-        """Calculate success rate percentage"""
-        if obj.total_records and obj.total_records > 0:
-            return round((obj.successful_records / obj.total_records) * 100, 2)
-        return 0.0
-
     def get_uploaded_by_details(self, obj):
         """Get detailed info about the user who uploaded the file"""
         if obj.uploaded_by:
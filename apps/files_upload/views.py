@@ -13,7 +13,8 @@ from .models import FileUpload
 from .serializers import (
     FileUploadSerializer,
     FileUploadListSerializer,
-    FileUploadDetailSerializer
+    FileUploadDetailSerializer,
+    format_file_size
 )
 from apps.uploads.models import FileUpload as UploadsFileUpload
 from django.http import FileResponse
@@ -156,6 +157,11 @@ class FileUploadViewSet(viewsets.ModelViewSet):
                 Q(filename__icontains=search)
             )
 
+        if self.action in ('list', 'recent'):
+            queryset = FileUploadListSerializer.setup_eager_loading(queryset)
+        elif self.action == 'retrieve':
+            queryset = FileUploadDetailSerializer.setup_eager_loading(queryset)
+
         return queryset.order_by('-created_at')
 
     @action(detail=False, methods=['get'])
@@ -181,15 +187,6 @@ class FileUploadViewSet(viewsets.ModelViewSet):
 
         total_file_size = sum(f.file_size or 0 for f in queryset)
 
-        def format_file_size(size):
-            if not size:
-                return "0 B"
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size < 1024.0:
-                    return f"{size:.1f} {unit}"
-                size /= 1024.0
-            return f"{size:.1f} TB"
-
         return Response({
             'total_files': total_files,
             'status_breakdown': {
@@ -2,6 +2,7 @@ import pandas as pd
 import hashlib
 import os
 import io
+import zipfile
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from rest_framework import viewsets, status
@@ -438,6 +439,21 @@ class FileUploadViewSet(viewsets.ModelViewSet):
                             'file_signature': header.hex()
                         }
                     }
+
+                # .xlsx is a zip archive; checking its end-of-central-directory
+                # record only reads the tail and rejects truncated uploads before
+                # they are hashed and parsed.
+                if header.startswith(xlsx_signature):
+                    is_complete = zipfile.is_zipfile(file)
+                    file.seek(0)
+                    if not is_complete:
+                        return {
+                            'valid': False,
+                            'error': 'The Excel file is incomplete or corrupted. Please upload it again.',
+                            'details': {
+                                'file_extension': file_extension,
+                            }
+                        }
             
            
 
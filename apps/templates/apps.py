@@ -1,4 +1,7 @@
 from django.apps import AppConfig
 class templatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.templates'
\ No newline at end of file
+    name = 'apps.templates'
+
+    def ready(self):
+        import apps.templates.signals
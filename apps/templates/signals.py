@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Template
+from .utils import invalidate_template_cache
+
+
+@receiver([post_save, post_delete], sender=Template)
+def invalidate_cached_template(sender, instance, **kwargs):
+    invalidate_template_cache(instance.pk)
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+
+from .models import Template
+
+TEMPLATE_CACHE_PREFIX = "template"
+TEMPLATE_CACHE_TIMEOUT = 600
+
+# Only the fields needed to render and send are cached so the payload stays
+# JSON-serializable for the Redis backend.
+CACHED_TEMPLATE_FIELDS = (
+    'id', 'name', 'template_type', 'channel', 'category',
+    'subject', 'content', 'variables', 'is_active',
+)
+
+
+def _template_cache_key(template_id):
+    return f"{TEMPLATE_CACHE_PREFIX}:{template_id}"
+
+
+def get_template(template_id):
+    """
+    Return the Template for ``template_id``, served from the cache when possible.
+
+    Raises Template.DoesNotExist (or ValueError for a malformed id) like
+    Template.objects.get so callers keep their existing error handling.
+    """
+    template_id = int(template_id)
+    key = _template_cache_key(template_id)
+    data = cache.get(key)
+    if data is None:
+        data = Template.objects.filter(pk=template_id).values(*CACHED_TEMPLATE_FIELDS).first()
+        if data is None:
+            raise Template.DoesNotExist(f"Template with id {template_id} does not exist")
+        cache.set(key, data, TEMPLATE_CACHE_TIMEOUT)
+    return Template(**data)
+
+
+def invalidate_template_cache(template_id):
+    cache.delete(_template_cache_key(template_id))
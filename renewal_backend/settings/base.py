@@ -410,8 +410,8 @@ ADMIN_EMAIL = config('ADMIN_EMAIL', default='sahinayasin17@gmail.com')
 # IMAP Settings (For Receiving Emails)
 IMAP_HOST = config('IMAP_HOST', default='imap.gmail.com')
 IMAP_PORT = config('IMAP_PORT', default=993, cast=int)
-IMAP_USER = config('EMAIL_HOST_USER', default='sahinayasin17@gmail.com') 
-IMAP_PASSWORD = config('IMAP_PASSWORD', default='dfdrihthgmbsntxk')
+IMAP_USER = config('IMAP_USER', default=EMAIL_HOST_USER)
+IMAP_PASSWORD = config('IMAP_PASSWORD', default=EMAIL_HOST_PASSWORD)
 if config('AWS_ACCESS_KEY_ID', default=None):
     # AWS S3 Configuration
     AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID')
@@ -537,6 +537,11 @@ LOGGING = {
             'level': config('LOG_LEVEL', default='INFO'),
             'propagate': False,
         },
+        'apps': {
+            'handlers': ['console', 'file'],
+            'level': config('LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
     },
 }
 
@@ -565,8 +570,15 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.email_inbox.tasks.process_scheduled_campaigns', 
         'schedule': crontab(minute='*'),
     },
+    'email-automation-log-purge-daily': {
+        'task': 'apps.email_integration.tasks.purge_old_automation_logs',
+        'schedule': crontab(hour=2, minute=30),
+    },
 }
 
+# Email automation logs older than this are deleted by the nightly purge task
+EMAIL_AUTOMATION_LOG_RETENTION_DAYS = config('EMAIL_AUTOMATION_LOG_RETENTION_DAYS', default=180, cast=int)
+
 
 # GOOGLE_GMAIL_PROJECT_ID = "intelipro-email"
 # GOOGLE_GMAIL_PUBSUB_TOPIC = "projects/intelipro-email/topics/gmail-notifications"
@@ -107,6 +107,9 @@ LOGGING['handlers']['security_file'] = {
     'formatter': 'verbose',
 }
 
+# Application errors also go to the error log
+LOGGING['loggers']['apps']['handlers'] = ['console', 'file', 'error_file']
+
 # Add security logging
 LOGGING['loggers']['django.security'] = {
     'handlers': ['security_file', 'console'],
@@ -16,7 +16,11 @@ call "C:\Users\Sahina1001\Downloads\Renewal_backend\venv\Scripts\activate.bat"
 
 :: Start Celery Worker
 echo Starting Celery Worker...
-start "" cmd /k "celery -A renewal_backend worker --loglevel=info"
+start "" cmd /k "celery -A renewal_backend worker -Q celery,webhook_queue --loglevel=info"
+
+:: Start Celery AI Worker (OpenAI analysis queue)
+echo Starting Celery AI Worker...
+start "" cmd /k "celery -A renewal_backend worker -Q ai_queue --concurrency=1 -n ai@%%h --loglevel=info"
 
 :: Start Celery Beat
 echo Starting Celery Beat...